@@ -1,5 +1,6 @@
 """OpenAI GPT adapter implementation."""
 
+import hashlib
 import logging
 import os
 from typing import Optional
@@ -19,11 +20,23 @@ from .exceptions import (
     LLMRateLimitError,
     LLMResponseError,
 )
-from .models import Message
+from .models import Message, MessageRole
 
 logger = logging.getLogger(__name__)
 
 
+def _prompt_cache_key(messages: list[Message]) -> Optional[str]:
+    """Derive an OpenAI prompt_cache_key from the system prompt.
+
+    Requests from the same caller share a system prompt, so keying on it
+    routes them to the same cache shard and improves prefix cache hits.
+    """
+    for message in messages:
+        if message.role == MessageRole.SYSTEM:
+            return hashlib.sha1(message.content.encode()).hexdigest()
+    return None
+
+
 class OpenAIAdapter(LLMAdapter):
     """LLM adapter for OpenAI GPT models.
 
@@ -101,6 +114,7 @@ class OpenAIAdapter(LLMAdapter):
 
         try:
             response_format = {"type": "json_object"} if json_mode else {"type": "text"}
+            cache_key = _prompt_cache_key(messages)
 
             response = client.chat.completions.create(
                 model=self._model,
@@ -108,6 +122,7 @@ class OpenAIAdapter(LLMAdapter):
                 temperature=temperature,
                 max_tokens=max_tokens,
                 response_format=response_format,  # type: ignore[arg-type]
+                extra_body={"prompt_cache_key": cache_key} if cache_key else None,
             )
 
             if not response.choices:
@@ -3,8 +3,8 @@
 REPLY_RESOLVER_SYSTEM_PROMPT = """You analyze sent email replies to determine which pending tasks they address.
 
 You will receive:
-1. The text of a sent reply
-2. A list of pending tasks associated with the email thread
+1. A list of pending tasks associated with the email thread
+2. The text of a sent reply
 
 For each task, decide whether the reply resolves, addresses, or completes that task.
 A task is "resolved" if the reply:
@@ -18,17 +18,12 @@ A task is NOT resolved if the reply doesn't mention or address it at all.
 Respond in JSON format only."""
 
 
-REPLY_RESOLVER_USER_PROMPT_TEMPLATE = """SUBJECT: {subject}
-
-SENT REPLY:
----
-{reply_body}
----
-
-PENDING TASKS:
+# The thread's task list comes first and the reply last, so calls for the
+# same thread share the longest possible prompt prefix (prompt caching).
+REPLY_RESOLVER_USER_PROMPT_TEMPLATE = """PENDING TASKS:
 {tasks_list}
 
-For each task, indicate whether this reply resolves it.
+For each task, indicate whether the sent reply below resolves it.
 Respond with a JSON object in this exact format:
 {{
     "resolved_tasks": [
@@ -38,4 +33,11 @@ Respond with a JSON object in this exact format:
             "reason": "Why this task is/isn't resolved by the reply"
         }}
     ]
-}}"""
+}}
+
+SUBJECT: {subject}
+
+SENT REPLY:
+---
+{reply_body}
+---"""
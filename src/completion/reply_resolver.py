@@ -2,6 +2,7 @@
 
 import json
 import logging
+import re
 from typing import Optional
 
 from src.analyzer.adapter import LLMAdapter
@@ -17,6 +18,13 @@ from .prompts import (
 
 logger = logging.getLogger(__name__)
 
+# Header block TaskManager.create_from_extracted_task writes above the
+# description; it doesn't help decide resolution and only spends tokens.
+# Anchored to the start so matching lines in the description are kept.
+_NOTES_HEADER_RE = re.compile(
+    r"\A(?:(?:Priority: \w+|Confidence: \d+%|Email: https://mail\.google\.com/\S*)[ \t]*(?:\n|\Z))*"
+)
+
 
 class ReplyResolver:
     """Uses an LLM to determine which tasks a sent reply addresses.
@@ -82,7 +90,8 @@ class ReplyResolver:
             # Extract a brief notes excerpt (strip metadata section)
             notes_excerpt = ""
             if task.notes:
-                notes_excerpt = task.notes.split(Task.METADATA_PREFIX)[0].strip()
+                notes_excerpt = task.notes.split(Task.METADATA_PREFIX)[0]
+                notes_excerpt = _NOTES_HEADER_RE.sub("", notes_excerpt).strip()
                 if len(notes_excerpt) > 200:
                     notes_excerpt = notes_excerpt[:200] + "..."
 
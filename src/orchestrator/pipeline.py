@@ -3,7 +3,7 @@
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 
 from src.analyzer import AnalysisResult, EmailAnalyzer
 from src.comments import CommentInterpreter
@@ -22,6 +22,10 @@ class EmailAgentOrchestrator:
     Connects EmailFetcher, EmailAnalyzer, and TaskManager into a single
     run with per-step error isolation and structured results.
 
+    Dependencies are created lazily on first use. Pass an instance to
+    use it directly, or a ``*_factory`` callable to control how the
+    default instance is built.
+
     Example:
         result = EmailAgentOrchestrator().run()
         print(f"Success: {result.success}")
@@ -36,6 +40,12 @@ class EmailAgentOrchestrator:
         comment_interpreter: Optional[CommentInterpreter] = None,
         reply_resolver: Optional[ReplyResolver] = None,
         max_emails: int = 50,
+        fetcher_factory: Callable[[], EmailFetcher] = EmailFetcher,
+        analyzer_factory: Callable[[], EmailAnalyzer] = EmailAnalyzer,
+        task_manager_factory: Callable[[], TaskManager] = TaskManager,
+        completion_checker_factory: Callable[..., CompletionChecker] = CompletionChecker,
+        comment_interpreter_factory: Callable[[], CommentInterpreter] = CommentInterpreter,
+        reply_resolver_factory: Callable[[], ReplyResolver] = ReplyResolver,
     ):
         self._fetcher = fetcher
         self._analyzer = analyzer
@@ -44,37 +54,43 @@ class EmailAgentOrchestrator:
         self._comment_interpreter = comment_interpreter
         self._reply_resolver = reply_resolver
         self._max_emails = max_emails
+        self._fetcher_factory = fetcher_factory
+        self._analyzer_factory = analyzer_factory
+        self._task_manager_factory = task_manager_factory
+        self._completion_checker_factory = completion_checker_factory
+        self._comment_interpreter_factory = comment_interpreter_factory
+        self._reply_resolver_factory = reply_resolver_factory
 
     def _get_fetcher(self) -> EmailFetcher:
         if self._fetcher is None:
-            self._fetcher = EmailFetcher()
+            self._fetcher = self._fetcher_factory()
         return self._fetcher
 
     def _get_analyzer(self) -> EmailAnalyzer:
         if self._analyzer is None:
-            self._analyzer = EmailAnalyzer()
+            self._analyzer = self._analyzer_factory()
         return self._analyzer
 
     def _get_task_manager(self) -> TaskManager:
         if self._task_manager is None:
-            self._task_manager = TaskManager()
+            self._task_manager = self._task_manager_factory()
         return self._task_manager
 
     def _get_reply_resolver(self) -> ReplyResolver:
         if self._reply_resolver is None:
-            self._reply_resolver = ReplyResolver()
+            self._reply_resolver = self._reply_resolver_factory()
         return self._reply_resolver
 
     def _get_completion_checker(self) -> CompletionChecker:
         if self._completion_checker is None:
-            self._completion_checker = CompletionChecker(
+            self._completion_checker = self._completion_checker_factory(
                 reply_resolver=self._get_reply_resolver(),
             )
         return self._completion_checker
 
     def _get_comment_interpreter(self) -> CommentInterpreter:
         if self._comment_interpreter is None:
-            self._comment_interpreter = CommentInterpreter()
+            self._comment_interpreter = self._comment_interpreter_factory()
         return self._comment_interpreter
 
     @staticmethod
@@ -208,9 +224,14 @@ class EmailAgentOrchestrator:
                 }
 
             tm = self._get_task_manager()
-            created = 0
+            pending = []
             skipped = 0
             non_actionable_filtered = 0
+            # Titles of the tasks each source email already has. A task is a
+            # duplicate only if its email has a task with the same title, so
+            # a run that created some of an email's tasks before failing
+            # creates the rest on the next run.
+            existing_titles: dict[str, set[str]] = {}
 
             for analysis in analyses:
                 if not analysis.is_actionable:
@@ -224,17 +245,25 @@ class EmailAgentOrchestrator:
                     continue
 
                 for task in analysis.tasks:
-                    existing = tm.find_tasks_by_email_id(task.source_email_id)
-                    if existing:
+                    email_id = task.source_email_id
+                    if email_id not in existing_titles:
+                        existing_titles[email_id] = {
+                            t.title for t in tm.find_tasks_by_email_id(email_id)
+                        }
+                    titles = existing_titles[email_id]
+                    if task.title in titles:
                         skipped += 1
                         logger.debug(
-                            "Skipping duplicate task for email %s",
-                            task.source_email_id,
+                            "Skipping duplicate task %r for email %s",
+                            task.title,
+                            email_id,
                         )
                         continue
 
-                    tm.create_from_extracted_task(task)
-                    created += 1
+                    titles.add(task.title)
+                    pending.append(task)
+
+            created = len(tm.create_from_extracted_tasks(pending)) if pending else 0
 
             logger.info(
                 "Created %d tasks (%d duplicates skipped, %d non-actionable filtered)",
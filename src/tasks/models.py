@@ -1,11 +1,16 @@
 """Data models for the tasks module."""
 
+import re
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from enum import Enum
 from typing import Any, Optional
 
 
+# One "key:value" line in the metadata section of a task's notes
+_METADATA_LINE_RE = re.compile(r"^(email_id|thread_id):(.*)$", re.MULTILINE)
+
+
 class TaskStatus(Enum):
     """Google Tasks status values."""
 
@@ -13,7 +18,16 @@ class TaskStatus(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+# Plain dict lookup; TaskStatus(value) goes through EnumMeta.__call__
+_STATUS_BY_VALUE: dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+
+
+def _parse_status(value: str) -> TaskStatus:
+    """Map an API status string to TaskStatus, raising ValueError if unknown."""
+    return _STATUS_BY_VALUE.get(value) or TaskStatus(value)
+
+
+@dataclass(slots=True)
 class TaskList:
     """Represents a Google Tasks list.
 
@@ -61,7 +75,7 @@ class TaskList:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a Google Task with email metadata.
 
@@ -128,7 +142,7 @@ class Task:
             id=data.get("id"),
             title=data["title"],
             notes=data.get("notes"),
-            status=TaskStatus(data.get("status", "needsAction")),
+            status=_parse_status(data.get("status", "needsAction")),
             due=due,
             completed=completed,
             source_email_id=data.get("source_email_id"),
@@ -201,24 +215,22 @@ class Task:
         source_email_id = None
         source_thread_id = None
         notes = data.get("notes", "")
-        clean_notes = notes
-
-        if cls.METADATA_PREFIX in notes:
-            parts = notes.split(cls.METADATA_PREFIX)
-            clean_notes = parts[0].rstrip()
-            if len(parts) > 1:
-                metadata_section = parts[1]
-                for line in metadata_section.strip().split("\n"):
-                    if line.startswith("email_id:"):
-                        source_email_id = line[9:].strip()
-                    elif line.startswith("thread_id:"):
-                        source_thread_id = line[10:].strip()
+        clean_notes, sep, metadata_block = notes.partition(cls.METADATA_PREFIX)
+
+        if sep:
+            clean_notes = clean_notes.rstrip()
+            # The regex only matches the two keys; a later line wins
+            for key, value in _METADATA_LINE_RE.findall(metadata_block):
+                if key == "email_id":
+                    source_email_id = value.strip()
+                else:
+                    source_thread_id = value.strip()
 
         return cls(
             id=data.get("id"),
             title=data.get("title", ""),
             notes=clean_notes if clean_notes else None,
-            status=TaskStatus(data.get("status", "needsAction")),
+            status=_parse_status(data.get("status", "needsAction")),
             due=due,
             completed=completed,
             source_email_id=source_email_id,
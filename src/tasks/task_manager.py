@@ -1,10 +1,13 @@
 """TaskManager for Google Tasks API integration."""
 
+import copy
 import logging
-from typing import Iterator, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
 
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
+from googleapiclient.http import MAX_BATCH_LIMIT, HttpRequest
 
 from src.analyzer.models import ExtractedTask, Priority
 
@@ -13,6 +16,7 @@ from .exceptions import (
     TaskListNotFoundError,
     TaskNotFoundError,
     TasksAPIError,
+    TasksError,
 )
 from .models import Task, TaskList, TaskStatus
 from .tasks_auth import TasksAuthenticator
@@ -22,6 +26,97 @@ logger = logging.getLogger(__name__)
 # Default task list name for email-generated tasks
 DEFAULT_LIST_NAME = "Email Tasks"
 
+# Partial response for tasks.list: only what Task.from_api_response reads
+_TASK_LIST_FIELDS = (
+    "nextPageToken,"
+    "items(id,title,notes,status,due,completed,position,parent,etag)"
+)
+
+
+def _not_found_error(error: HttpError, context: str, reason: str) -> TasksError:
+    return TaskNotFoundError(task_id=context)
+
+
+def _rate_limit_error(error: HttpError, context: str, reason: str) -> TasksError:
+    retry_after = error.resp.get("retry-after")
+    return RateLimitError(retry_after=int(retry_after) if retry_after else None)
+
+
+def _api_error(error: HttpError, context: str, reason: str) -> TasksError:
+    msg = f"Google Tasks API error: {reason}"
+    if context:
+        msg = f"{context}: {msg}"
+    return TasksAPIError(msg, status_code=error.resp.status, reason=reason)
+
+
+# HTTP status -> exception builder; anything else becomes a TasksAPIError
+_STATUS_ERRORS: dict[int, Callable[[HttpError, str, str], TasksError]] = {
+    404: _not_found_error,
+    429: _rate_limit_error,
+}
+
+
+def _task_from_extracted(extracted: ExtractedTask) -> Task:
+    """Build a Google Task, with source email metadata, from an ExtractedTask."""
+    # Build notes with priority and context
+    notes_parts = []
+    notes_parts.append(f"Priority: {extracted.priority.value}")
+    if extracted.confidence < 1.0:
+        notes_parts.append(f"Confidence: {extracted.confidence:.0%}")
+    if extracted.source_thread_id:
+        notes_parts.append(
+            f"Email: https://mail.google.com/mail/#all/{extracted.source_thread_id}"
+        )
+    notes_parts.append("")
+    notes_parts.append(extracted.description)
+
+    return Task(
+        title=extracted.title,
+        notes="\n".join(notes_parts),
+        due=extracted.due_date,
+        source_email_id=extracted.source_email_id,
+        source_thread_id=extracted.source_thread_id,
+    )
+
+
+@dataclass
+class _TaskIndex:
+    """Snapshot of a task list, indexed by source thread and email ID."""
+
+    tasks: dict[str, Task] = field(default_factory=dict)
+    by_thread: dict[str, list[str]] = field(default_factory=dict)
+    by_email: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, task: Task) -> None:
+        """Insert a task, replacing any previous version with the same ID."""
+        self.remove(task.id)
+        self.tasks[task.id] = task
+        if task.source_thread_id:
+            self.by_thread.setdefault(task.source_thread_id, []).append(task.id)
+        if task.source_email_id:
+            self.by_email.setdefault(task.source_email_id, []).append(task.id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task if present."""
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return
+        if task.source_thread_id:
+            self.by_thread[task.source_thread_id].remove(task_id)
+        if task.source_email_id:
+            self.by_email[task.source_email_id].remove(task_id)
+
+    def lookup(
+        self, ids_by_key: dict[str, list[str]], key: str, include_completed: bool
+    ) -> list[Task]:
+        """Return copies of the indexed tasks for a thread or email ID."""
+        tasks = (self.tasks[task_id] for task_id in ids_by_key.get(key, ()))
+        return [
+            copy.copy(task)
+            for task in tasks
+            if include_completed or task.status != TaskStatus.COMPLETED
+        ]
+
 
 class TaskManager:
     """Manages tasks in Google Tasks.
@@ -46,7 +141,9 @@ class TaskManager:
         self._authenticator = authenticator or TasksAuthenticator()
         self._service: Optional[Resource] = None
         self._default_list_name = default_list_name
-        self._default_list_id: Optional[str] = None
+        self._default_list: Optional[TaskList] = None
+        # Per-list snapshots backing the find_tasks_by_* lookups
+        self._task_indexes: dict[str, _TaskIndex] = {}
 
     def _get_service(self) -> Resource:
         """Get the Google Tasks API service."""
@@ -70,18 +167,8 @@ class TaskManager:
         reason = error.reason if hasattr(error, "reason") else str(error)
         logger.error("Google Tasks API error (status=%d): %s", status_code, reason)
 
-        if status_code == 404:
-            raise TaskNotFoundError(task_id=context) from error
-        elif status_code == 429:
-            retry_after = error.resp.get("retry-after")
-            raise RateLimitError(
-                retry_after=int(retry_after) if retry_after else None
-            ) from error
-        else:
-            msg = f"Google Tasks API error: {reason}"
-            if context:
-                msg = f"{context}: {msg}"
-            raise TasksAPIError(msg, status_code=status_code, reason=reason) from error
+        build_error = _STATUS_ERRORS.get(status_code, _api_error)
+        raise build_error(error, context, reason) from error
 
     # -------------------- Task List Operations --------------------
 
@@ -122,6 +209,7 @@ class TaskManager:
             return TaskList.from_api_response(result)
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskListNotFoundError(list_id) from e
             self._handle_http_error(e, f"Failed to get task list {list_id}")
             raise
@@ -149,29 +237,104 @@ class TaskManager:
     def get_or_create_default_list(self) -> TaskList:
         """Get the default task list for email tasks, creating if needed.
 
+        The list is resolved once and cached for the lifetime of the
+        manager, so task operations on the default list don't each pay a
+        lookup round-trip. The cache is dropped whenever an operation on
+        the list gets a 404, so a deleted list is looked up (or recreated)
+        again on the next call.
+
         Returns:
             TaskList for storing email-generated tasks.
         """
-        # Check cache first
-        if self._default_list_id:
-            try:
-                return self.get_task_list(self._default_list_id)
-            except TaskListNotFoundError:
-                self._default_list_id = None
+        if self._default_list is not None:
+            return self._default_list
 
         # Search for existing list
         for task_list in self.list_task_lists():
             if task_list.title == self._default_list_name:
-                self._default_list_id = task_list.id
+                self._default_list = task_list
                 logger.debug("Using existing task list '%s' (id=%s)", task_list.title, task_list.id)
                 return task_list
 
         # Create new list
         task_list = self.create_task_list(self._default_list_name)
-        self._default_list_id = task_list.id
+        self._default_list = task_list
         logger.info("Created task list '%s' (id=%s)", task_list.title, task_list.id)
         return task_list
 
+    def _forget_list(self, list_id: str) -> None:
+        """Drop cached state for a list after the API returned 404 for it.
+
+        A 404 for a task can't be told apart from one for a deleted list,
+        so both discard the list's task index and, if it is the default
+        list, the cached default list lookup.
+        """
+        self._task_indexes.pop(list_id, None)
+        if self._default_list is not None and self._default_list.id == list_id:
+            self._default_list = None
+
+    def _get_task_index(self, list_id: Optional[str]) -> _TaskIndex:
+        """Get the task index for a list, listing its tasks on first use.
+
+        The snapshot is kept in step with tasks created, updated and
+        deleted through this manager; changes made elsewhere (e.g. in the
+        Google Tasks UI) are not seen until a new TaskManager is created.
+        """
+        if list_id is None:
+            list_id = self.get_or_create_default_list().id
+
+        index = self._task_indexes.get(list_id)
+        if index is None:
+            index = _TaskIndex()
+            for task in self.list_tasks(list_id, show_completed=True):
+                index.add(task)
+            self._task_indexes[list_id] = index
+        return index
+
+    def _index_task(self, task: Task, list_id: str) -> None:
+        """Record a created or updated task in the list's index, if built."""
+        index = self._task_indexes.get(list_id)
+        if index is not None:
+            index.add(task)
+
+    def _execute_batch(
+        self, requests: list[tuple[str, HttpRequest]], context: str
+    ) -> tuple[list[dict], list[tuple[str, HttpError]]]:
+        """Send requests as batched HTTP calls.
+
+        Args:
+            requests: (request_id, request) pairs; IDs must be unique.
+            context: Context for the error raised if a whole batch fails.
+
+        Returns:
+            Responses of the requests that succeeded, in request order, and
+            (request_id, error) pairs for the ones that failed.
+
+        Raises:
+            TasksAPIError: If a batch as a whole fails.
+        """
+        responses: list[dict] = []
+        errors: list[tuple[str, HttpError]] = []
+
+        def _collect(request_id: str, response: dict, exception: Optional[HttpError]) -> None:
+            if exception is not None:
+                errors.append((request_id, exception))
+            else:
+                responses.append(response)
+
+        try:
+            service = self._get_service()
+            for start in range(0, len(requests), MAX_BATCH_LIMIT):
+                batch = service.new_batch_http_request(callback=_collect)
+                for request_id, request in requests[start : start + MAX_BATCH_LIMIT]:
+                    batch.add(request, request_id=request_id)
+                batch.execute()
+        except HttpError as e:
+            self._handle_http_error(e, context)
+            raise
+
+        return responses, errors
+
     # -------------------- Task CRUD Operations --------------------
 
     def create_task(self, task: Task, list_id: Optional[str] = None) -> Task:
@@ -197,10 +360,12 @@ class TaskManager:
             body = task.to_api_body()
             result = service.tasks().insert(tasklist=list_id, body=body).execute()
             created = Task.from_api_response(result, task_list_id=list_id)
+            self._index_task(created, list_id)
             logger.info("Created task '%s' (id=%s)", created.title, created.id)
             return created
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskListNotFoundError(list_id) from e
             self._handle_http_error(e, "Failed to create task")
             raise
@@ -229,6 +394,7 @@ class TaskManager:
             return Task.from_api_response(result, task_list_id=list_id)
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskNotFoundError(task_id, list_id) from e
             self._handle_http_error(e, f"Failed to get task {task_id}")
             raise
@@ -265,9 +431,12 @@ class TaskManager:
                 .update(tasklist=list_id, task=task.id, body=body)
                 .execute()
             )
-            return Task.from_api_response(result, task_list_id=list_id)
+            updated = Task.from_api_response(result, task_list_id=list_id)
+            self._index_task(updated, list_id)
+            return updated
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskNotFoundError(task.id, list_id) from e
             self._handle_http_error(e, f"Failed to update task {task.id}")
             raise
@@ -292,10 +461,15 @@ class TaskManager:
             service.tasks().delete(tasklist=list_id, task=task_id).execute()
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskNotFoundError(task_id, list_id) from e
             self._handle_http_error(e, f"Failed to delete task {task_id}")
             raise
 
+        index = self._task_indexes.get(list_id)
+        if index is not None:
+            index.remove(task_id)
+
     def list_tasks(
         self,
         list_id: Optional[str] = None,
@@ -335,6 +509,7 @@ class TaskManager:
                         showHidden=show_hidden,
                         maxResults=max_results,
                         pageToken=page_token,
+                        fields=_TASK_LIST_FIELDS,
                     )
                     .execute()
                 )
@@ -348,6 +523,7 @@ class TaskManager:
 
         except HttpError as e:
             if e.resp.status == 404:
+                self._forget_list(list_id)
                 raise TaskListNotFoundError(list_id) from e
             self._handle_http_error(e, f"Failed to list tasks in {list_id}")
             raise
@@ -368,9 +544,9 @@ class TaskManager:
             TaskNotFoundError: If the task doesn't exist.
             TasksAPIError: If the API call fails.
         """
-        task = self.get_task(task_id, list_id)
-        task.mark_completed()
-        updated = self.update_task(task, list_id)
+        updated = self._patch_task_status(
+            task_id, {"status": TaskStatus.COMPLETED.value}, list_id
+        )
         logger.info("Marked task %s as completed", task_id)
         return updated
 
@@ -388,9 +564,39 @@ class TaskManager:
             TaskNotFoundError: If the task doesn't exist.
             TasksAPIError: If the API call fails.
         """
-        task = self.get_task(task_id, list_id)
-        task.mark_incomplete()
-        return self.update_task(task, list_id)
+        return self._patch_task_status(
+            task_id,
+            {"status": TaskStatus.NEEDS_ACTION.value, "completed": None},
+            list_id,
+        )
+
+    def _patch_task_status(
+        self, task_id: str, body: dict, list_id: Optional[str]
+    ) -> Task:
+        """Apply a status change with a single PATCH rather than get+update.
+
+        The API fills in the completion timestamp itself when a task is
+        completed; a null ``completed`` clears it again.
+        """
+        if list_id is None:
+            list_id = self.get_or_create_default_list().id
+
+        try:
+            service = self._get_service()
+            result = (
+                service.tasks()
+                .patch(tasklist=list_id, task=task_id, body=body)
+                .execute()
+            )
+        except HttpError as e:
+            if e.resp.status == 404:
+                self._forget_list(list_id)
+                raise TaskNotFoundError(task_id, list_id) from e
+            self._handle_http_error(e, f"Failed to update task {task_id}")
+            raise
+        updated = Task.from_api_response(result, task_list_id=list_id)
+        self._index_task(updated, list_id)
+        return updated
 
     # -------------------- Email Integration --------------------
 
@@ -411,27 +617,73 @@ class TaskManager:
         Returns:
             Created Task with ID populated.
         """
-        # Build notes with priority and context
-        notes_parts = []
-        notes_parts.append(f"Priority: {extracted.priority.value}")
-        if extracted.confidence < 1.0:
-            notes_parts.append(f"Confidence: {extracted.confidence:.0%}")
-        if extracted.source_thread_id:
-            notes_parts.append(
-                f"Email: https://mail.google.com/mail/#all/{extracted.source_thread_id}"
-            )
-        notes_parts.append("")
-        notes_parts.append(extracted.description)
-
-        task = Task(
-            title=extracted.title,
-            notes="\n".join(notes_parts),
-            due=extracted.due_date,
-            source_email_id=extracted.source_email_id,
-            source_thread_id=extracted.source_thread_id,
+        return self.create_task(_task_from_extracted(extracted), list_id)
+
+    def create_from_extracted_tasks(
+        self,
+        extracted_tasks: list[ExtractedTask],
+        list_id: Optional[str] = None,
+    ) -> list[Task]:
+        """Create Google Tasks for several ExtractedTasks at once.
+
+        Like create_from_extracted_task, but the inserts are sent as
+        batched HTTP requests instead of one round-trip per task.
+
+        Args:
+            extracted_tasks: ExtractedTasks from email analysis.
+            list_id: Task list ID. Uses default list if not specified.
+
+        Returns:
+            Created Tasks with IDs populated, in input order.
+
+        Raises:
+            TaskListNotFoundError: If the specified list doesn't exist.
+            TasksAPIError: If the API call fails.
+        """
+        if not extracted_tasks:
+            return []
+        if list_id is None:
+            list_id = self.get_or_create_default_list().id
+
+        service = self._get_service()
+        responses, errors = self._execute_batch(
+            [
+                (
+                    str(i),
+                    service.tasks().insert(
+                        tasklist=list_id,
+                        body=_task_from_extracted(extracted).to_api_body(),
+                    ),
+                )
+                for i, extracted in enumerate(extracted_tasks)
+            ],
+            "Failed to create tasks",
         )
 
-        return self.create_task(task, list_id)
+        created_tasks = []
+        for response in responses:
+            created = Task.from_api_response(response, task_list_id=list_id)
+            self._index_task(created, list_id)
+            created_tasks.append(created)
+        logger.info("Created %d tasks in %s", len(created_tasks), list_id)
+
+        if errors:
+            # Only the first failure is raised; don't lose the rest
+            for request_id, other in errors[1:]:
+                logger.error(
+                    "Failed to create task %r in %s (status=%d): %s",
+                    extracted_tasks[int(request_id)].title,
+                    list_id,
+                    other.resp.status,
+                    other,
+                )
+            _, error = errors[0]
+            if error.resp.status == 404:
+                self._forget_list(list_id)
+                raise TaskListNotFoundError(list_id) from error
+            self._handle_http_error(error, "Failed to create task")
+
+        return created_tasks
 
     def find_tasks_by_thread_id(
         self,
@@ -442,6 +694,8 @@ class TaskManager:
         """Find all tasks associated with an email thread.
 
         Used for T07 (linking tasks to email threads) and T08 (completion detection).
+        The list is fetched once per TaskManager and indexed by thread and
+        email ID, so repeated lookups don't re-list every task.
 
         Args:
             thread_id: Gmail thread ID to search for.
@@ -451,10 +705,8 @@ class TaskManager:
         Returns:
             List of tasks associated with the thread.
         """
-        matching_tasks = []
-        for task in self.list_tasks(list_id, show_completed=include_completed):
-            if task.source_thread_id == thread_id:
-                matching_tasks.append(task)
+        index = self._get_task_index(list_id)
+        matching_tasks = index.lookup(index.by_thread, thread_id, include_completed)
         logger.debug("Thread %s: found %d matching tasks", thread_id, len(matching_tasks))
         return matching_tasks
 
@@ -474,11 +726,8 @@ class TaskManager:
         Returns:
             List of tasks associated with the email.
         """
-        matching_tasks = []
-        for task in self.list_tasks(list_id, show_completed=include_completed):
-            if task.source_email_id == email_id:
-                matching_tasks.append(task)
-        return matching_tasks
+        index = self._get_task_index(list_id)
+        return index.lookup(index.by_email, email_id, include_completed)
 
     def complete_tasks_for_thread(
         self,
@@ -488,6 +737,8 @@ class TaskManager:
         """Mark all tasks for an email thread as completed.
 
         Used when a reply is detected to the originating email thread.
+        The status updates are sent as batched HTTP requests rather than
+        a get and an update round-trip per task.
 
         Args:
             thread_id: Gmail thread ID.
@@ -495,12 +746,52 @@ class TaskManager:
 
         Returns:
             List of tasks that were marked as completed.
+
+        Raises:
+            TaskNotFoundError: If a task disappeared before it was completed.
+            TasksAPIError: If the API call fails.
         """
+        tasks = self.find_tasks_by_thread_id(thread_id, list_id, include_completed=False)
+        if list_id is None:
+            list_id = self.get_or_create_default_list().id
+
+        service = self._get_service()
+        responses, errors = self._execute_batch(
+            [
+                (
+                    task.id,
+                    service.tasks().patch(
+                        tasklist=list_id,
+                        task=task.id,
+                        body={"status": TaskStatus.COMPLETED.value},
+                    ),
+                )
+                for task in tasks
+            ],
+            f"Failed to complete tasks for thread {thread_id}",
+        )
+
         completed_tasks = []
-        for task in self.find_tasks_by_thread_id(
-            thread_id, list_id, include_completed=False
-        ):
-            completed_task = self.complete_task(task.id, list_id)
-            completed_tasks.append(completed_task)
+        for response in responses:
+            completed = Task.from_api_response(response, task_list_id=list_id)
+            self._index_task(completed, list_id)
+            completed_tasks.append(completed)
+
+        if errors:
+            # Only the first failure is raised; don't lose the rest
+            for other_id, other in errors[1:]:
+                logger.error(
+                    "Failed to complete task %s in %s (status=%d): %s",
+                    other_id,
+                    list_id,
+                    other.resp.status,
+                    other,
+                )
+            task_id, error = errors[0]
+            if error.resp.status == 404:
+                self._forget_list(list_id)
+                raise TaskNotFoundError(task_id, list_id) from error
+            self._handle_http_error(error, f"Failed to complete task {task_id}")
+
         logger.info("Completed %d tasks for thread %s", len(completed_tasks), thread_id)
         return completed_tasks
@@ -0,0 +1,78 @@
+"""Shared pytest fixtures."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+FROZEN_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime subclass whose now() always returns FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        if tz is None:
+            return FROZEN_NOW.replace(tzinfo=None)
+        return FROZEN_NOW.astimezone(tz)
+
+
+@pytest.fixture
+def freeze_now(monkeypatch):
+    """Freeze datetime.now() in the orchestrator pipeline.
+
+    Returns the frozen (UTC) timestamp so tests can compare exactly.
+    """
+    monkeypatch.setattr("src.orchestrator.pipeline.datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--llm-replay-file",
+        default=None,
+        metavar="PATH",
+        help=(
+            "JSONL file of recorded LLM completions for integration tests. "
+            "Recorded prompts are replayed; new ones are called live and appended."
+        ),
+    )
+
+
+class _JsonlResponseStore:
+    """Append-only JSONL store with the get/set interface of pytest's cache."""
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._entries: dict[str, object] = {}
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+
+    def get(self, key: str, default):
+        return self._entries.get(key, default)
+
+    def set(self, key: str, value) -> None:
+        self._entries[key] = value
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "response": value}, separators=(",", ":")))
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def llm_response_store(pytestconfig):
+    """Where integration tests record and replay LLM completions.
+
+    The --llm-replay-file JSONL log if given (e.g. restored from a CI
+    cache), otherwise pytest's own cache directory.
+    """
+    replay_file = pytestconfig.getoption("--llm-replay-file")
+    if replay_file:
+        return _JsonlResponseStore(Path(replay_file))
+    return pytestconfig.cache
@@ -450,6 +450,32 @@ class TestOpenAIAdapter:
             call_kwargs = mock_client.chat.completions.create.call_args[1]
             assert call_kwargs["response_format"] == {"type": "json_object"}
 
+    def test_complete_prompt_cache_key_follows_system_prompt(self):
+        """Test that calls sharing a system prompt share a prompt_cache_key."""
+        adapter = OpenAIAdapter(api_key="test-key")
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+
+        with patch.object(adapter, "_get_client") as mock_get_client:
+            mock_client = MagicMock()
+            mock_client.chat.completions.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            for system, user in [("Sys A", "one"), ("Sys A", "two"), ("Sys B", "one")]:
+                adapter.complete(
+                    [Message(MessageRole.SYSTEM, system), Message(MessageRole.USER, user)]
+                )
+            adapter.complete([Message(MessageRole.USER, "no system")])
+
+            keys = [
+                (c.kwargs["extra_body"] or {}).get("prompt_cache_key")
+                for c in mock_client.chat.completions.create.call_args_list
+            ]
+            assert keys[0] == keys[1]
+            assert keys[0] != keys[2]
+            assert keys[3] is None
+
     def test_complete_empty_choices_raises(self):
         """Test that empty choices raises error."""
         adapter = OpenAIAdapter(api_key="test-key")
@@ -1,16 +1,42 @@
 """Unit tests for the EmailAgentOrchestrator."""
 
+import sys
 from datetime import date, datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock
 
 import pytest
 
-from src.analyzer import AnalysisResult, EmailType, ExtractedTask, Priority
+import run_agent
+from src.analyzer import AnalysisResult, EmailAnalyzer, EmailType, ExtractedTask, Priority
 from src.comments import ProcessingResult
-from src.fetcher import Email
-from src.orchestrator import EmailAgentOrchestrator, PipelineResult, StepResult
 from src.completion import CompletionResult
-from src.tasks import Task
+from src.fetcher import Email, EmailFetcher
+from src.orchestrator import EmailAgentOrchestrator, PipelineResult, StepResult
+from src.tasks import Task, TaskManager
+
+pytestmark = pytest.mark.usefixtures("freeze_now")
+
+# Returned by mocked create_from_extracted_tasks; never mutated by the pipeline.
+_REVIEW_TASK = Task(title="Review document", id="task1")
+
+# Fixed start time for PipelineResult tests that never read the clock.
+_STARTED_AT = datetime(2025, 1, 1)
+
+# Stand-in return value for mock factories whose product is never used.
+_SENTINEL = object()
+
+
+def _build_step(spec: str) -> StepResult:
+    """Build a StepResult from a '<name>-ok' or '<name>-fail' spec."""
+    name, _, outcome = spec.partition("-")
+    success = outcome == "ok"
+    return StepResult(
+        name=name,
+        success=success,
+        duration_seconds=0.0,
+        details={},
+        error=None if success else f"{name} failed",
+    )
 
 
 def _make_email(id: str = "msg1", thread_id: str = "thread1") -> Email:
@@ -44,6 +70,34 @@ def _make_analysis(email: Email) -> AnalysisResult:
     )
 
 
+@pytest.fixture
+def mock_factories():
+    """Mock factories for every lazily-created orchestrator dependency."""
+    return {
+        name: Mock(return_value=_SENTINEL)
+        for name in (
+            "fetcher",
+            "analyzer",
+            "task_manager",
+            "completion_checker",
+            "comment_interpreter",
+            "reply_resolver",
+        )
+    }
+
+
+@pytest.fixture
+def bare_orchestrator(mock_factories):
+    """Orchestrator with no injected instances, built from mock factories.
+
+    Function-scoped so lazily-initialized attributes like ``_fetcher``
+    never leak between tests.
+    """
+    return EmailAgentOrchestrator(
+        **{f"{name}_factory": factory for name, factory in mock_factories.items()}
+    )
+
+
 class TestStepResult:
     def test_successful_step(self):
         step = StepResult(
@@ -68,78 +122,99 @@ class TestStepResult:
 
 
 class TestPipelineResult:
-    def test_success_when_all_steps_pass(self):
-        result = PipelineResult(started_at=datetime.now())
-        result.steps = [
-            StepResult(name="fetch", success=True, duration_seconds=1.0, details={}),
-            StepResult(name="analyze", success=True, duration_seconds=2.0, details={}),
-        ]
-        assert result.success is True
+    @pytest.mark.parametrize(
+        "steps, expected",
+        [
+            (("fetch-ok", "analyze-ok"), True),
+            (("fetch-ok", "analyze-fail"), False),
+            ((), True),
+        ],
+        ids=["all_steps_pass", "any_step_fails", "no_steps"],
+    )
+    def test_success_property(self, steps, expected):
+        result = PipelineResult(started_at=_STARTED_AT)
+        result.steps = [_build_step(spec) for spec in steps]
+        assert result.success is expected
 
-    def test_failure_when_any_step_fails(self):
-        result = PipelineResult(started_at=datetime.now())
-        result.steps = [
-            StepResult(name="fetch", success=True, duration_seconds=1.0, details={}),
-            StepResult(
-                name="analyze",
-                success=False,
-                duration_seconds=0.1,
-                details={},
-                error="LLM error",
-            ),
-        ]
-        assert result.success is False
 
-    def test_success_with_no_steps(self):
-        result = PipelineResult(started_at=datetime.now())
-        assert result.success is True
+# Spec'd collaborator mocks are built once per module and reset after each
+# TestEmailAgentOrchestrator test; copy.copy() of a prototype is not an
+# option because shallow copies share their child mocks.
+
+
+@pytest.fixture(scope="module")
+def fetcher():
+    """Mock EmailFetcher; tests configure fetch_unread as needed."""
+    return Mock(spec=EmailFetcher)
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Mock EmailAnalyzer; tests configure analyze as needed."""
+    return Mock(spec=EmailAnalyzer)
+
+
+@pytest.fixture(scope="module")
+def task_manager():
+    """Mock TaskManager; tests configure lookups and creation as needed."""
+    return Mock(spec=TaskManager)
 
 
 class TestEmailAgentOrchestrator:
-    def _make_orchestrator(self, fetcher=None, analyzer=None, task_manager=None):
+    @pytest.fixture(autouse=True)
+    def _reset_collaborators(self, fetcher, analyzer, task_manager):
+        """Clear configured behaviour and call history between tests."""
+        yield
+        for mock in (fetcher, analyzer, task_manager):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+    @pytest.fixture
+    def orchestrator(self, fetcher, analyzer, task_manager):
+        """Orchestrator wired to the mock fetcher, analyzer and task manager."""
         return EmailAgentOrchestrator(
-            fetcher=fetcher or MagicMock(),
-            analyzer=analyzer or MagicMock(),
-            task_manager=task_manager or MagicMock(),
+            fetcher=fetcher,
+            analyzer=analyzer,
+            task_manager=task_manager,
         )
 
-    def test_full_pipeline_success(self):
+    def test_full_pipeline_success(
+        self, orchestrator, fetcher, analyzer, task_manager, freeze_now
+    ):
         email = _make_email()
         analysis = _make_analysis(email)
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email]
-
-        analyzer = MagicMock()
         analyzer.analyze.return_value = analysis
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.return_value = []
-        task_manager.create_from_extracted_task.return_value = Task(
-            title="Review document", id="task1"
-        )
+        task_manager.create_from_extracted_tasks.return_value = [_REVIEW_TASK]
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
         assert len(result.steps) == 3
-        assert result.steps[0].name == "fetch"
-        assert result.steps[0].details["emails_fetched"] == 1
-        assert result.steps[1].name == "analyze"
-        assert result.steps[1].details["emails_analyzed"] == 1
-        assert result.steps[1].details["tasks_found"] == 1
-        assert result.steps[2].name == "create_tasks"
-        assert result.steps[2].details["tasks_created"] == 1
-        assert result.steps[2].details["duplicates_skipped"] == 0
-        assert result.steps[2].details["non_actionable_filtered"] == 0
+        assert [step.name for step in result.steps] == [
+            "fetch",
+            "analyze",
+            "create_tasks",
+        ]
+        assert result.steps[0].details == {"emails_fetched": 1}
+        assert result.steps[1].details == {
+            "emails_analyzed": 1,
+            "tasks_found": 1,
+            "non_actionable": 0,
+            "errors": 0,
+        }
+        assert result.steps[2].details == {
+            "tasks_created": 1,
+            "duplicates_skipped": 0,
+            "non_actionable_filtered": 0,
+        }
         assert result.finished_at is not None
+        assert result.started_at == result.finished_at == freeze_now
 
-    def test_no_emails_returns_success(self):
-        fetcher = MagicMock()
+    def test_no_emails_returns_success(self, orchestrator, fetcher):
         fetcher.fetch_unread.return_value = []
 
-        orchestrator = self._make_orchestrator(fetcher=fetcher)
         result = orchestrator.run()
 
         assert result.success is True
@@ -148,11 +223,9 @@ class TestEmailAgentOrchestrator:
         assert result.steps[2].details["tasks_created"] == 0
         assert result.steps[2].details["non_actionable_filtered"] == 0
 
-    def test_fetch_failure_skips_later_steps(self):
-        fetcher = MagicMock()
+    def test_fetch_failure_skips_later_steps(self, orchestrator, fetcher):
         fetcher.fetch_unread.side_effect = RuntimeError("Gmail API down")
 
-        orchestrator = self._make_orchestrator(fetcher=fetcher)
         result = orchestrator.run()
 
         assert result.success is False
@@ -162,24 +235,18 @@ class TestEmailAgentOrchestrator:
         assert result.steps[1].skipped is True
         assert result.steps[2].skipped is True
 
-    def test_analyze_failure_for_single_email_is_isolated(self):
+    def test_analyze_failure_for_single_email_is_isolated(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         email1 = _make_email(id="msg1")
         email2 = _make_email(id="msg2")
         analysis2 = _make_analysis(email2)
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email1, email2]
-
-        analyzer = MagicMock()
         analyzer.analyze.side_effect = [RuntimeError("LLM timeout"), analysis2]
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.return_value = []
-        task_manager.create_from_extracted_task.return_value = Task(
-            title="Review document", id="task1"
-        )
+        task_manager.create_from_extracted_tasks.return_value = [_REVIEW_TASK]
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
@@ -187,44 +254,85 @@ class TestEmailAgentOrchestrator:
         assert result.steps[1].details["errors"] == 1
         assert result.steps[2].details["tasks_created"] == 1
 
-    def test_duplicate_tasks_are_skipped(self):
+    def test_duplicate_tasks_are_skipped(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         email = _make_email()
         analysis = _make_analysis(email)
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email]
-
-        analyzer = MagicMock()
         analyzer.analyze.return_value = analysis
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.return_value = [
-            Task(title="Existing task", id="existing1")
+            Task(title="Review document", id="existing1")
         ]
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
         assert result.steps[2].details["tasks_created"] == 0
         assert result.steps[2].details["duplicates_skipped"] == 1
-        task_manager.create_from_extracted_task.assert_not_called()
+        task_manager.create_from_extracted_tasks.assert_not_called()
 
-    def test_max_emails_passed_to_fetcher(self):
-        fetcher = MagicMock()
+    def test_missing_tasks_created_after_partial_batch_failure(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
+        email = _make_email()
+        analysis = AnalysisResult(
+            email_id=email.id,
+            thread_id=email.thread_id,
+            summary="Two tasks",
+            tasks=[
+                ExtractedTask(
+                    title=title,
+                    description="",
+                    priority=Priority.MEDIUM,
+                    source_email_id=email.id,
+                    source_thread_id=email.thread_id,
+                )
+                for title in ("Task A", "Task B")
+            ],
+        )
+        fetcher.fetch_unread.return_value = [email]
+        analyzer.analyze.return_value = analysis
+
+        # First run: "Task A" is inserted, "Task B" fails
+        task_manager.find_tasks_by_email_id.return_value = []
+        task_manager.create_from_extracted_tasks.side_effect = RuntimeError(
+            "Failed to create task"
+        )
+        assert orchestrator.run().steps[2].success is False
+
+        # Next run sees "Task A" on the list and creates only "Task B"
+        task_manager.find_tasks_by_email_id.return_value = [
+            Task(title="Task A", id="tidA", source_email_id=email.id)
+        ]
+        task_manager.create_from_extracted_tasks.side_effect = lambda tasks: [
+            Task(title=t.title, id=f"tid{i}") for i, t in enumerate(tasks)
+        ]
+
+        result = orchestrator.run()
+
+        assert result.steps[2].details["tasks_created"] == 1
+        assert result.steps[2].details["duplicates_skipped"] == 1
+        (created,) = task_manager.create_from_extracted_tasks.call_args.args
+        assert [t.title for t in created] == ["Task B"]
+
+    def test_max_emails_passed_to_fetcher(self, fetcher, analyzer, task_manager):
         fetcher.fetch_unread.return_value = []
 
         orchestrator = EmailAgentOrchestrator(
             fetcher=fetcher,
-            analyzer=MagicMock(),
-            task_manager=MagicMock(),
+            analyzer=analyzer,
+            task_manager=task_manager,
             max_emails=10,
         )
         orchestrator.run()
 
         fetcher.fetch_unread.assert_called_once_with(max_results=10)
 
-    def test_multiple_tasks_from_multiple_emails(self):
+    def test_multiple_tasks_from_multiple_emails(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         email1 = _make_email(id="msg1", thread_id="t1")
         email2 = _make_email(id="msg2", thread_id="t2")
 
@@ -264,38 +372,32 @@ class TestEmailAgentOrchestrator:
             ],
         )
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email1, email2]
-
-        analyzer = MagicMock()
         analyzer.analyze.side_effect = [analysis1, analysis2]
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.return_value = []
-        task_manager.create_from_extracted_task.return_value = Task(
-            title="t", id="tid"
-        )
+        task_manager.create_from_extracted_tasks.side_effect = lambda tasks: [
+            Task(title=t.title, id=f"tid{i}") for i, t in enumerate(tasks)
+        ]
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.steps[1].details["tasks_found"] == 3
         assert result.steps[2].details["tasks_created"] == 3
-
-    def test_create_tasks_failure_is_isolated(self):
+        # One duplicate check per source email, one batched create for all tasks
+        assert task_manager.find_tasks_by_email_id.call_count == 2
+        (created,) = task_manager.create_from_extracted_tasks.call_args.args
+        assert [t.title for t in created] == ["Task A", "Task B", "Task C"]
+
+    def test_create_tasks_failure_is_isolated(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         email = _make_email()
         analysis = _make_analysis(email)
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email]
-
-        analyzer = MagicMock()
         analyzer.analyze.return_value = analysis
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.side_effect = RuntimeError("API error")
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is False
@@ -304,7 +406,9 @@ class TestEmailAgentOrchestrator:
         assert result.steps[2].success is False
         assert "API error" in result.steps[2].error
 
-    def test_newsletter_emails_are_filtered(self):
+    def test_newsletter_emails_are_filtered(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         """Test that newsletter emails don't produce tasks."""
         email = _make_email()
         newsletter_analysis = AnalysisResult(
@@ -317,23 +421,19 @@ class TestEmailAgentOrchestrator:
             sender_name="Bloomberg",
         )
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email]
-
-        analyzer = MagicMock()
         analyzer.analyze.return_value = newsletter_analysis
 
-        task_manager = MagicMock()
-
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
         assert result.steps[2].details["non_actionable_filtered"] == 1
         assert result.steps[2].details["tasks_created"] == 0
-        task_manager.create_from_extracted_task.assert_not_called()
+        task_manager.create_from_extracted_tasks.assert_not_called()
 
-    def test_mixed_personal_and_newsletter_emails(self):
+    def test_mixed_personal_and_newsletter_emails(
+        self, orchestrator, fetcher, analyzer, task_manager
+    ):
         """Test pipeline with both personal and newsletter emails."""
         email1 = _make_email(id="msg1", thread_id="t1")
         email2 = _make_email(id="msg2", thread_id="t2")
@@ -363,27 +463,19 @@ class TestEmailAgentOrchestrator:
             sender_name="TechDigest",
         )
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email1, email2]
-
-        analyzer = MagicMock()
         analyzer.analyze.side_effect = [personal_analysis, newsletter_analysis]
-
-        task_manager = MagicMock()
         task_manager.find_tasks_by_email_id.return_value = []
-        task_manager.create_from_extracted_task.return_value = Task(
-            title="Review document", id="task1"
-        )
+        task_manager.create_from_extracted_tasks.return_value = [_REVIEW_TASK]
 
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
         assert result.steps[2].details["tasks_created"] == 1
         assert result.steps[2].details["non_actionable_filtered"] == 1
-        assert task_manager.create_from_extracted_task.call_count == 1
+        task_manager.create_from_extracted_tasks.assert_called_once()
 
-    def test_marketing_emails_are_filtered(self):
+    def test_marketing_emails_are_filtered(self, orchestrator, fetcher, analyzer):
         """Test that marketing emails are also filtered."""
         email = _make_email()
         marketing_analysis = AnalysisResult(
@@ -396,53 +488,35 @@ class TestEmailAgentOrchestrator:
             sender_name="Store",
         )
 
-        fetcher = MagicMock()
         fetcher.fetch_unread.return_value = [email]
-
-        analyzer = MagicMock()
         analyzer.analyze.return_value = marketing_analysis
 
-        task_manager = MagicMock()
-
-        orchestrator = self._make_orchestrator(fetcher, analyzer, task_manager)
         result = orchestrator.run()
 
         assert result.success is True
         assert result.steps[2].details["non_actionable_filtered"] == 1
         assert result.steps[2].details["tasks_created"] == 0
 
-    def test_lazy_init_creates_default_instances(self):
+    def test_lazy_init_creates_default_instances(self, bare_orchestrator, mock_factories):
         """Test that None parameters trigger lazy initialization."""
-        orchestrator = EmailAgentOrchestrator()
-
-        with patch("src.orchestrator.pipeline.EmailFetcher") as mock_fetcher_cls:
-            mock_fetcher_cls.return_value = MagicMock()
-            fetcher = orchestrator._get_fetcher()
-            mock_fetcher_cls.assert_called_once()
-
-        with patch("src.orchestrator.pipeline.EmailAnalyzer") as mock_analyzer_cls:
-            mock_analyzer_cls.return_value = MagicMock()
-            analyzer = orchestrator._get_analyzer()
-            mock_analyzer_cls.assert_called_once()
-
-        with patch("src.orchestrator.pipeline.TaskManager") as mock_tm_cls:
-            mock_tm_cls.return_value = MagicMock()
-            tm = orchestrator._get_task_manager()
-            mock_tm_cls.assert_called_once()
-
-        with patch(
-            "src.orchestrator.pipeline.CompletionChecker"
-        ) as mock_checker_cls, patch(
-            "src.orchestrator.pipeline.ReplyResolver"
-        ) as mock_resolver_cls:
-            mock_checker_cls.return_value = MagicMock()
-            mock_resolver_cls.return_value = MagicMock()
-            checker = orchestrator._get_completion_checker()
-            mock_checker_cls.assert_called_once()
-            # ReplyResolver should be created and passed to CompletionChecker
-            mock_resolver_cls.assert_called_once()
-            call_kwargs = mock_checker_cls.call_args.kwargs
-            assert "reply_resolver" in call_kwargs
+        bare_orchestrator._get_fetcher()
+        mock_factories["fetcher"].assert_called_once()
+
+        bare_orchestrator._get_analyzer()
+        mock_factories["analyzer"].assert_called_once()
+
+        bare_orchestrator._get_task_manager()
+        mock_factories["task_manager"].assert_called_once()
+
+        bare_orchestrator._get_completion_checker()
+        mock_factories["completion_checker"].assert_called_once()
+        # ReplyResolver should be created and passed to CompletionChecker
+        mock_factories["reply_resolver"].assert_called_once()
+        call_kwargs = mock_factories["completion_checker"].call_args.kwargs
+        assert "reply_resolver" in call_kwargs
+
+        bare_orchestrator._get_comment_interpreter()
+        mock_factories["comment_interpreter"].assert_called_once()
 
 
 class TestReplyResolverWiring:
@@ -450,53 +524,58 @@ class TestReplyResolverWiring:
 
     def test_completion_checker_gets_reply_resolver(self):
         """Test that _get_completion_checker passes a ReplyResolver."""
-        orchestrator = EmailAgentOrchestrator()
+        mock_resolver = Mock()
+        captured = {}
 
-        with patch(
-            "src.orchestrator.pipeline.CompletionChecker"
-        ) as mock_checker_cls, patch(
-            "src.orchestrator.pipeline.ReplyResolver"
-        ) as mock_resolver_cls:
-            mock_resolver = MagicMock()
-            mock_resolver_cls.return_value = mock_resolver
-            mock_checker_cls.return_value = MagicMock()
+        def checker_factory(**kwargs):
+            captured.update(kwargs)
+            return _SENTINEL
 
-            orchestrator._get_completion_checker()
+        orchestrator = EmailAgentOrchestrator(
+            completion_checker_factory=checker_factory,
+            reply_resolver_factory=Mock(return_value=mock_resolver),
+        )
 
-            mock_checker_cls.assert_called_once_with(
-                reply_resolver=mock_resolver,
-            )
+        orchestrator._get_completion_checker()
+
+        assert captured == {"reply_resolver": mock_resolver}
 
     def test_injected_reply_resolver_is_used(self):
         """Test that an injected ReplyResolver is passed through."""
-        mock_resolver = MagicMock()
-        orchestrator = EmailAgentOrchestrator(reply_resolver=mock_resolver)
+        mock_resolver = Mock()
+        captured = {}
+
+        def checker_factory(**kwargs):
+            captured.update(kwargs)
+            return _SENTINEL
 
-        with patch(
-            "src.orchestrator.pipeline.CompletionChecker"
-        ) as mock_checker_cls:
-            mock_checker_cls.return_value = MagicMock()
+        orchestrator = EmailAgentOrchestrator(
+            reply_resolver=mock_resolver,
+            completion_checker_factory=checker_factory,
+        )
 
-            orchestrator._get_completion_checker()
+        orchestrator._get_completion_checker()
 
-            call_kwargs = mock_checker_cls.call_args.kwargs
-            assert call_kwargs["reply_resolver"] is mock_resolver
+        assert captured["reply_resolver"] is mock_resolver
 
     def test_injected_completion_checker_skips_resolver_creation(self):
         """Test that injecting a CompletionChecker skips ReplyResolver creation."""
-        mock_checker = MagicMock()
-        orchestrator = EmailAgentOrchestrator(completion_checker=mock_checker)
+        mock_checker = Mock()
+        resolver_factory = Mock()
+        interpreter_factory = Mock(return_value=_SENTINEL)
+        orchestrator = EmailAgentOrchestrator(
+            completion_checker=mock_checker,
+            reply_resolver_factory=resolver_factory,
+            comment_interpreter_factory=interpreter_factory,
+        )
 
         result = orchestrator._get_completion_checker()
 
         assert result is mock_checker
+        resolver_factory.assert_not_called()
 
-        with patch(
-            "src.orchestrator.pipeline.CommentInterpreter"
-        ) as mock_interpreter_cls:
-            mock_interpreter_cls.return_value = MagicMock()
-            interpreter = orchestrator._get_comment_interpreter()
-            mock_interpreter_cls.assert_called_once()
+        orchestrator._get_comment_interpreter()
+        interpreter_factory.assert_called_once()
 
 
 class TestCompletionCheck:
@@ -508,7 +587,7 @@ class TestCompletionCheck:
             thread_task_map={"t1": ["task1"], "t2": ["task2"]},
         )
 
-        checker = MagicMock()
+        checker = Mock()
         checker.check_for_completions.return_value = completion_result
 
         orchestrator = EmailAgentOrchestrator(completion_checker=checker)
@@ -523,7 +602,7 @@ class TestCompletionCheck:
         assert result.finished_at is not None
 
     def test_completion_check_no_matches(self):
-        checker = MagicMock()
+        checker = Mock()
         checker.check_for_completions.return_value = CompletionResult()
 
         orchestrator = EmailAgentOrchestrator(completion_checker=checker)
@@ -535,7 +614,7 @@ class TestCompletionCheck:
         assert result.steps[0].details["tasks_completed"] == 0
 
     def test_completion_check_failure_captured(self):
-        checker = MagicMock()
+        checker = Mock()
         checker.check_for_completions.side_effect = RuntimeError("Gmail unavailable")
 
         orchestrator = EmailAgentOrchestrator(completion_checker=checker)
@@ -554,7 +633,7 @@ class TestCompletionCheck:
             errors=["Failed to complete tasks for thread t2: API error"],
         )
 
-        checker = MagicMock()
+        checker = Mock()
         checker.check_for_completions.return_value = completion_result
 
         orchestrator = EmailAgentOrchestrator(completion_checker=checker)
@@ -573,7 +652,7 @@ class TestCommentProcessing:
             commands_executed=3,
         )
 
-        interpreter = MagicMock()
+        interpreter = Mock()
         interpreter.process_pending_tasks.return_value = processing_result
 
         orchestrator = EmailAgentOrchestrator(comment_interpreter=interpreter)
@@ -588,7 +667,7 @@ class TestCommentProcessing:
         assert result.finished_at is not None
 
     def test_comment_processing_no_commands(self):
-        interpreter = MagicMock()
+        interpreter = Mock()
         interpreter.process_pending_tasks.return_value = ProcessingResult(
             tasks_scanned=3,
         )
@@ -602,7 +681,7 @@ class TestCommentProcessing:
         assert result.steps[0].details["commands_executed"] == 0
 
     def test_comment_processing_failure_captured(self):
-        interpreter = MagicMock()
+        interpreter = Mock()
         interpreter.process_pending_tasks.side_effect = RuntimeError(
             "Tasks API unavailable"
         )
@@ -622,7 +701,7 @@ class TestCommentProcessing:
             errors=["Error processing task 'Buy milk' (t1): API error"],
         )
 
-        interpreter = MagicMock()
+        interpreter = Mock()
         interpreter.process_pending_tasks.return_value = processing_result
 
         orchestrator = EmailAgentOrchestrator(comment_interpreter=interpreter)
@@ -633,107 +712,79 @@ class TestCommentProcessing:
         assert "errors" in result.steps[0].details
 
 
+@pytest.fixture
+def run_cli(monkeypatch):
+    """Call run_agent.main() with the given command-line arguments."""
+
+    def _run(*args: str) -> int:
+        monkeypatch.setattr(sys, "argv", ["run_agent.py", *args])
+        return run_agent.main()
+
+    return _run
+
+
+@pytest.fixture
+def mock_orch(monkeypatch):
+    """Mock EmailAgentOrchestrator class whose pipeline runs succeed with no steps."""
+    cls = Mock()
+    orchestrator = cls.return_value
+    for method in (
+        orchestrator.run,
+        orchestrator.run_completion_check,
+        orchestrator.run_comment_processing,
+    ):
+        method.return_value.success = True
+        method.return_value.steps = []
+    monkeypatch.setattr(run_agent, "EmailAgentOrchestrator", cls)
+    return cls
+
+
+@pytest.fixture
+def mock_reporter(monkeypatch):
+    """Mock DigestReporter class; tests configure the delivery outcome."""
+    cls = Mock()
+    monkeypatch.setattr(run_agent, "DigestReporter", cls)
+    return cls
+
+
 class TestRunAgentCLI:
-    def test_main_returns_zero_on_success(self):
-        with patch("run_agent.EmailAgentOrchestrator") as mock_cls:
-            mock_result = MagicMock()
-            mock_result.success = True
-            mock_result.steps = []
-            mock_cls.return_value.run.return_value = mock_result
-
-            from run_agent import main
-
-            with patch("sys.argv", ["run_agent.py"]):
-                assert main() == 0
-
-    def test_main_returns_one_on_failure(self):
-        with patch("run_agent.EmailAgentOrchestrator") as mock_cls:
-            mock_result = MagicMock()
-            mock_result.success = False
-            mock_result.steps = []
-            mock_cls.return_value.run.return_value = mock_result
-
-            from run_agent import main
-
-            with patch("sys.argv", ["run_agent.py"]):
-                assert main() == 1
-
-    def test_max_emails_argument(self):
-        with patch("run_agent.EmailAgentOrchestrator") as mock_cls:
-            mock_result = MagicMock()
-            mock_result.success = True
-            mock_result.steps = []
-            mock_cls.return_value.run.return_value = mock_result
-
-            from run_agent import main
-
-            with patch("sys.argv", ["run_agent.py", "--max-emails", "10"]):
-                main()
-
-            mock_cls.assert_called_once_with(max_emails=10)
-
-    def test_check_completions_flag(self):
-        with patch("run_agent.EmailAgentOrchestrator") as mock_cls:
-            mock_result = MagicMock()
-            mock_result.success = True
-            mock_result.steps = []
-            mock_cls.return_value.run_completion_check.return_value = mock_result
-
-            from run_agent import main
-
-            with patch(
-                "sys.argv", ["run_agent.py", "--check-completions"]
-            ):
-                assert main() == 0
-
-            mock_cls.return_value.run_completion_check.assert_called_once()
-            mock_cls.return_value.run.assert_not_called()
-
-    def test_process_comments_flag(self):
-        with patch("run_agent.EmailAgentOrchestrator") as mock_cls:
-            mock_result = MagicMock()
-            mock_result.success = True
-            mock_result.steps = []
-            mock_cls.return_value.run_comment_processing.return_value = mock_result
-
-            from run_agent import main
-
-            with patch(
-                "sys.argv", ["run_agent.py", "--process-comments"]
-            ):
-                assert main() == 0
-
-            mock_cls.return_value.run_comment_processing.assert_called_once()
-            mock_cls.return_value.run.assert_not_called()
-
-    def test_send_digest_flag(self):
-        with patch("run_agent.DigestReporter") as mock_reporter_cls:
-            mock_delivery = MagicMock()
-            mock_delivery.plain_text_output = "Digest summary here"
-            mock_delivery.errors = []
-            mock_reporter_cls.return_value.generate_and_send.return_value = (
-                mock_delivery
-            )
+    def test_main_returns_zero_on_success(self, mock_orch, run_cli):
+        assert run_cli() == 0
 
-            from run_agent import main
+    def test_main_returns_one_on_failure(self, mock_orch, run_cli):
+        mock_orch.return_value.run.return_value.success = False
+        assert run_cli() == 1
 
-            with patch("sys.argv", ["run_agent.py", "--send-digest", "user@example.com"]):
-                assert main() == 0
+    def test_max_emails_argument(self, mock_orch, run_cli):
+        run_cli("--max-emails", "10")
+        mock_orch.assert_called_once_with(max_emails=10)
 
-            mock_reporter_cls.return_value.generate_and_send.assert_called_once_with(
-                recipient="user@example.com"
-            )
+    def test_check_completions_flag(self, mock_orch, run_cli):
+        assert run_cli("--check-completions") == 0
 
-    def test_send_digest_flag_with_errors(self):
-        with patch("run_agent.DigestReporter") as mock_reporter_cls:
-            mock_delivery = MagicMock()
-            mock_delivery.plain_text_output = "Partial digest"
-            mock_delivery.errors = ["Failed to send email: SMTP error"]
-            mock_reporter_cls.return_value.generate_and_send.return_value = (
-                mock_delivery
-            )
+        mock_orch.return_value.run_completion_check.assert_called_once()
+        mock_orch.return_value.run.assert_not_called()
+
+    def test_process_comments_flag(self, mock_orch, run_cli):
+        assert run_cli("--process-comments") == 0
+
+        mock_orch.return_value.run_comment_processing.assert_called_once()
+        mock_orch.return_value.run.assert_not_called()
+
+    def test_send_digest_flag(self, mock_reporter, run_cli):
+        delivery = mock_reporter.return_value.generate_and_send.return_value
+        delivery.plain_text_output = "Digest summary here"
+        delivery.errors = []
+
+        assert run_cli("--send-digest", "user@example.com") == 0
+
+        mock_reporter.return_value.generate_and_send.assert_called_once_with(
+            recipient="user@example.com"
+        )
 
-            from run_agent import main
+    def test_send_digest_flag_with_errors(self, mock_reporter, run_cli):
+        delivery = mock_reporter.return_value.generate_and_send.return_value
+        delivery.plain_text_output = "Partial digest"
+        delivery.errors = ["Failed to send email: SMTP error"]
 
-            with patch("sys.argv", ["run_agent.py", "--send-digest", "user@example.com"]):
-                assert main() == 1
+        assert run_cli("--send-digest", "user@example.com") == 1
@@ -14,48 +14,104 @@ from src.tasks.models import Task
 # ==================== Fixtures ====================
 
 
-@pytest.fixture
+_SAMPLE_TASKS = (
+    Task(
+        title="Review proposal",
+        id="task1",
+        notes="Priority: high\nConfidence: 95%\n\nReview the Q1 proposal document",
+    ),
+    Task(
+        title="Schedule meeting with Sarah",
+        id="task2",
+        notes="Priority: medium\n\nSet up a 30-min sync about the project timeline",
+    ),
+    Task(
+        title="Update budget spreadsheet",
+        id="task3",
+        notes="Priority: low\n\nAdd Q2 projections to the budget sheet",
+    ),
+)
+
+
+@pytest.fixture(scope="module")
 def mock_adapter():
-    """Create a mock LLMAdapter."""
-    adapter = MagicMock(spec=LLMAdapter)
+    """Create a mock LLMAdapter shared across the module.
+
+    Call history, return values and side effects are cleared after each
+    test by ``_reset_mock_adapter``.
+    """
+    adapter = MagicMock(spec_set=LLMAdapter)
     adapter.model_name = "test-model"
     adapter.provider_name = "test-provider"
     return adapter
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_tasks():
-    """Create sample tasks for testing."""
-    return [
-        Task(
-            title="Review proposal",
-            id="task1",
-            notes="Priority: high\nConfidence: 95%\n\nReview the Q1 proposal document",
-        ),
-        Task(
-            title="Schedule meeting with Sarah",
-            id="task2",
-            notes="Priority: medium\n\nSet up a 30-min sync about the project timeline",
-        ),
-        Task(
-            title="Update budget spreadsheet",
-            id="task3",
-            notes="Priority: low\n\nAdd Q2 projections to the budget sheet",
-        ),
-    ]
+    """Sample open tasks for a thread.
+
+    A tuple, so tests sharing it cannot reorder or drop entries; resolve()
+    only iterates over the tasks it is given.
+    """
+    return _SAMPLE_TASKS
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def resolver(mock_adapter):
     """Create a ReplyResolver with mock adapter."""
     return ReplyResolver(adapter=mock_adapter)
 
 
+@pytest.fixture(autouse=True)
+def _reset_mock_adapter(mock_adapter):
+    """Isolate tests that share the module-scoped mock adapter."""
+    yield
+    mock_adapter.reset_mock(return_value=True, side_effect=True)
+
+
 def _make_response(resolved_tasks: list[dict]) -> str:
     """Helper to create a valid JSON response string."""
     return json.dumps({"resolved_tasks": resolved_tasks})
 
 
+def _get_messages(mock_adapter) -> list:
+    """Return the messages passed to the adapter's last complete() call."""
+    call_args = mock_adapter.complete.call_args
+    return call_args.kwargs.get("messages") or call_args[0][0]
+
+
+# Static LLM responses shared across tests
+_RESP_EMPTY = _make_response([])
+_RESP_ALL_RESOLVED = _make_response(
+    [
+        {"task_id": "task1", "resolved": True, "reason": "Reviewed proposal"},
+        {"task_id": "task2", "resolved": True, "reason": "Meeting scheduled"},
+        {"task_id": "task3", "resolved": True, "reason": "Budget updated"},
+    ]
+)
+_RESP_SOME_RESOLVED = _make_response(
+    [
+        {"task_id": "task1", "resolved": True, "reason": "Proposal reviewed"},
+        {"task_id": "task2", "resolved": False, "reason": "Not mentioned"},
+        {"task_id": "task3", "resolved": True, "reason": "Budget updated"},
+    ]
+)
+_RESP_NONE_RESOLVED = _make_response(
+    [
+        {"task_id": "task1", "resolved": False, "reason": "Not addressed"},
+        {"task_id": "task2", "resolved": False, "reason": "Not addressed"},
+        {"task_id": "task3", "resolved": False, "reason": "Not addressed"},
+    ]
+)
+_RESP_TASK1_RESOLVED = _make_response(
+    [{"task_id": "task1", "resolved": True, "reason": "Done"}]
+)
+
+# Too long for the compiler to constant-fold, so built once here
+_LONG_REPLY = "A" * 10000
+_TRUNCATED_REPLY = "A" * ReplyResolver.MAX_REPLY_LENGTH
+
+
 # ==================== Core Resolution Tests ====================
 
 
@@ -64,43 +120,25 @@ class TestResolve:
 
     def test_resolve_all_tasks(self, resolver, mock_adapter, sample_tasks):
         """Test when reply addresses all tasks."""
-        mock_adapter.complete.return_value = _make_response(
-            [
-                {"task_id": "task1", "resolved": True, "reason": "Reviewed proposal"},
-                {"task_id": "task2", "resolved": True, "reason": "Meeting scheduled"},
-                {"task_id": "task3", "resolved": True, "reason": "Budget updated"},
-            ]
-        )
+        mock_adapter.complete.return_value = _RESP_ALL_RESOLVED
 
         result = resolver.resolve("I've handled everything.", "Re: Tasks", sample_tasks)
 
-        assert sorted(result) == ["task1", "task2", "task3"]
+        assert set(result) == {"task1", "task2", "task3"}
 
     def test_resolve_some_tasks(self, resolver, mock_adapter, sample_tasks):
         """Test when reply addresses only some tasks."""
-        mock_adapter.complete.return_value = _make_response(
-            [
-                {"task_id": "task1", "resolved": True, "reason": "Proposal reviewed"},
-                {"task_id": "task2", "resolved": False, "reason": "Not mentioned"},
-                {"task_id": "task3", "resolved": True, "reason": "Budget updated"},
-            ]
-        )
+        mock_adapter.complete.return_value = _RESP_SOME_RESOLVED
 
         result = resolver.resolve(
             "I reviewed the proposal and updated the budget.", "Re: Tasks", sample_tasks
         )
 
-        assert sorted(result) == ["task1", "task3"]
+        assert set(result) == {"task1", "task3"}
 
     def test_resolve_no_tasks(self, resolver, mock_adapter, sample_tasks):
         """Test when reply doesn't address any tasks."""
-        mock_adapter.complete.return_value = _make_response(
-            [
-                {"task_id": "task1", "resolved": False, "reason": "Not addressed"},
-                {"task_id": "task2", "resolved": False, "reason": "Not addressed"},
-                {"task_id": "task3", "resolved": False, "reason": "Not addressed"},
-            ]
-        )
+        mock_adapter.complete.return_value = _RESP_NONE_RESOLVED
 
         result = resolver.resolve("Thanks for the update.", "Re: FYI", sample_tasks)
 
@@ -140,9 +178,7 @@ class TestResolve:
 
     def test_resolve_uses_json_mode(self, resolver, mock_adapter, sample_tasks):
         """Test that the adapter is called with json_mode=True."""
-        mock_adapter.complete.return_value = _make_response(
-            [{"task_id": "task1", "resolved": True, "reason": "Done"}]
-        )
+        mock_adapter.complete.return_value = _RESP_TASK1_RESOLVED
 
         resolver.resolve("Reply", "Subject", sample_tasks)
 
@@ -151,9 +187,7 @@ class TestResolve:
 
     def test_resolve_uses_zero_temperature(self, resolver, mock_adapter, sample_tasks):
         """Test that the adapter is called with temperature=0.0."""
-        mock_adapter.complete.return_value = _make_response(
-            [{"task_id": "task1", "resolved": True, "reason": "Done"}]
-        )
+        mock_adapter.complete.return_value = _RESP_TASK1_RESOLVED
 
         resolver.resolve("Reply", "Subject", sample_tasks)
 
@@ -164,76 +198,74 @@ class TestResolve:
 # ==================== Prompt Construction Tests ====================
 
 
-class TestBuildMessages:
-    """Tests for message construction."""
-
-    def test_includes_task_titles_in_prompt(self, resolver, mock_adapter, sample_tasks):
-        """Test that task titles appear in the LLM prompt."""
-        mock_adapter.complete.return_value = _make_response([])
+@pytest.fixture(scope="module")
+def captured_messages(resolver, mock_adapter, sample_tasks):
+    """Messages sent to the LLM for a single representative resolve call.
 
-        resolver.resolve("Reply text", "Subject", sample_tasks)
-
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
-        user_content = messages[1].content
+    Captured once per module; the returned list is unaffected by
+    ``_reset_mock_adapter`` clearing the adapter's call history.
+    """
+    mock_adapter.complete.return_value = _RESP_EMPTY
 
-        assert "Review proposal" in user_content
-        assert "Schedule meeting with Sarah" in user_content
-        assert "Update budget spreadsheet" in user_content
+    resolver.resolve(
+        "I've reviewed the proposal and it looks good.",
+        "Re: Important Meeting",
+        sample_tasks,
+    )
 
-    def test_includes_task_ids_in_prompt(self, resolver, mock_adapter, sample_tasks):
-        """Test that task IDs appear in the LLM prompt."""
-        mock_adapter.complete.return_value = _make_response([])
+    return _get_messages(mock_adapter)
 
-        resolver.resolve("Reply text", "Subject", sample_tasks)
 
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
-        user_content = messages[1].content
-
-        assert "task1" in user_content
-        assert "task2" in user_content
-        assert "task3" in user_content
-
-    def test_includes_subject_in_prompt(self, resolver, mock_adapter, sample_tasks):
-        """Test that the email subject appears in the prompt."""
-        mock_adapter.complete.return_value = _make_response([])
-
-        resolver.resolve("Reply text", "Re: Important Meeting", sample_tasks)
-
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
-        user_content = messages[1].content
-
-        assert "Re: Important Meeting" in user_content
-
-    def test_includes_reply_body_in_prompt(self, resolver, mock_adapter, sample_tasks):
-        """Test that the reply body appears in the prompt."""
-        mock_adapter.complete.return_value = _make_response([])
-        reply = "I've reviewed the proposal and it looks good."
-
-        resolver.resolve(reply, "Subject", sample_tasks)
-
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
-        user_content = messages[1].content
+class TestBuildMessages:
+    """Tests for message construction."""
 
-        assert reply in user_content
+    @pytest.mark.parametrize(
+        "needle",
+        [
+            # Task titles
+            "Review proposal",
+            "Schedule meeting with Sarah",
+            "Update budget spreadsheet",
+            # Task IDs
+            "task1",
+            "task2",
+            "task3",
+            # Subject
+            "Re: Important Meeting",
+            # Reply body
+            "I've reviewed the proposal and it looks good.",
+        ],
+    )
+    def test_prompt_contains(self, captured_messages, needle):
+        """Test that task details, subject and reply appear in the LLM prompt."""
+        assert needle in captured_messages[1].content
+
+    def test_has_system_and_user_messages(self, captured_messages):
+        """Test that both system and user messages are built."""
+        assert len(captured_messages) == 2
+        assert captured_messages[0].role.value == "system"
+        assert captured_messages[1].role.value == "user"
+
+    def test_reply_follows_task_list(self, captured_messages):
+        """Test that the per-call reply comes after the cacheable task list."""
+        user_content = captured_messages[1].content
+        assert user_content.startswith("PENDING TASKS:")
+        assert user_content.index("Review proposal") < user_content.index(
+            "I've reviewed the proposal and it looks good."
+        )
 
     def test_truncates_long_reply(self, resolver, mock_adapter, sample_tasks):
         """Test that long reply bodies are truncated."""
-        mock_adapter.complete.return_value = _make_response([])
-        long_reply = "A" * 10000
+        mock_adapter.complete.return_value = _RESP_EMPTY
 
-        resolver.resolve(long_reply, "Subject", sample_tasks)
+        resolver.resolve(_LONG_REPLY, "Subject", sample_tasks)
 
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
+        messages = _get_messages(mock_adapter)
         user_content = messages[1].content
 
         # Should be truncated to MAX_REPLY_LENGTH
-        assert "A" * 10000 not in user_content
-        assert "A" * 8000 in user_content
+        assert _LONG_REPLY not in user_content
+        assert _TRUNCATED_REPLY in user_content
 
     def test_strips_metadata_from_task_notes(self, resolver, mock_adapter):
         """Test that email-agent metadata is stripped from task notes in prompt."""
@@ -244,12 +276,11 @@ class TestBuildMessages:
                 notes="Review the doc carefully\n\n---email-agent-metadata---\nemail_id:msg1\nthread_id:thread1",
             )
         ]
-        mock_adapter.complete.return_value = _make_response([])
+        mock_adapter.complete.return_value = _RESP_EMPTY
 
         resolver.resolve("Reply", "Subject", tasks)
 
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
+        messages = _get_messages(mock_adapter)
         user_content = messages[1].content
 
         assert "Review the doc carefully" in user_content
@@ -258,29 +289,15 @@ class TestBuildMessages:
     def test_task_without_notes(self, resolver, mock_adapter):
         """Test tasks with no notes still work."""
         tasks = [Task(title="Do something", id="t1", notes=None)]
-        mock_adapter.complete.return_value = _make_response([])
+        mock_adapter.complete.return_value = _RESP_EMPTY
 
         resolver.resolve("Reply", "Subject", tasks)
 
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
+        messages = _get_messages(mock_adapter)
         user_content = messages[1].content
 
         assert "Do something" in user_content
 
-    def test_has_system_and_user_messages(self, resolver, mock_adapter, sample_tasks):
-        """Test that both system and user messages are built."""
-        mock_adapter.complete.return_value = _make_response([])
-
-        resolver.resolve("Reply", "Subject", sample_tasks)
-
-        call_args = mock_adapter.complete.call_args
-        messages = call_args.kwargs.get("messages") or call_args[0][0]
-
-        assert len(messages) == 2
-        assert messages[0].role.value == "system"
-        assert messages[1].role.value == "user"
-
 
 # ==================== Response Parsing Tests ====================
 
@@ -318,7 +335,7 @@ class TestParseResponse:
 
     def test_parse_empty_resolved_tasks(self, resolver, sample_tasks):
         """Test response with empty resolved_tasks array."""
-        response = _make_response([])
+        response = _RESP_EMPTY
 
         result = resolver._parse_response(response, sample_tasks)
 
@@ -338,7 +355,7 @@ class TestParseResponse:
 
         result = resolver._parse_response(response, sample_tasks)
 
-        assert sorted(result) == ["task1", "task2"]
+        assert set(result) == {"task1", "task2"}
 
     def test_parse_filters_invalid_task_ids(self, resolver, sample_tasks):
         """Test that task IDs not in input are filtered."""
@@ -357,32 +374,34 @@ class TestParseResponse:
 # ==================== Retry Logic Tests ====================
 
 
+@pytest.fixture(scope="module")
+def resolver_retry_1(mock_adapter):
+    """Create a ReplyResolver that retries a failed parse only once."""
+    return ReplyResolver(adapter=mock_adapter, max_retries=1)
+
+
 class TestRetryLogic:
     """Tests for retry behavior on parse errors."""
 
-    def test_retry_on_parse_error(self, mock_adapter, sample_tasks):
+    def test_retry_on_parse_error(self, resolver, mock_adapter, sample_tasks):
         """Test that a failed parse is retried."""
         mock_adapter.complete.side_effect = [
             "not json",  # First call: bad JSON
-            _make_response(  # Second call: valid JSON
-                [{"task_id": "task1", "resolved": True, "reason": "OK"}]
-            ),
+            _RESP_TASK1_RESOLVED,  # Second call: valid JSON
         ]
 
-        resolver = ReplyResolver(adapter=mock_adapter, max_retries=2)
+        # The shared resolver uses the default of two retries
         result = resolver.resolve("Reply", "Subject", sample_tasks)
 
         assert result == ["task1"]
         assert mock_adapter.complete.call_count == 2
 
-    def test_max_retries_exceeded(self, mock_adapter, sample_tasks):
+    def test_max_retries_exceeded(self, resolver_retry_1, mock_adapter, sample_tasks):
         """Test that LLMResponseError is raised after max retries."""
         mock_adapter.complete.return_value = "always bad json"
 
-        resolver = ReplyResolver(adapter=mock_adapter, max_retries=1)
-
         with pytest.raises(LLMResponseError):
-            resolver.resolve("Reply", "Subject", sample_tasks)
+            resolver_retry_1.resolve("Reply", "Subject", sample_tasks)
 
         # 1 initial + 1 retry = 2 calls
         assert mock_adapter.complete.call_count == 2
@@ -396,19 +415,19 @@ class TestCustomPrompts:
 
     def test_custom_system_prompt(self, mock_adapter, sample_tasks):
         """Test using a custom system prompt."""
-        mock_adapter.complete.return_value = _make_response([])
+        mock_adapter.complete.return_value = _RESP_EMPTY
         resolver = ReplyResolver(
             adapter=mock_adapter, system_prompt="Custom system prompt"
         )
 
         resolver.resolve("Reply", "Subject", sample_tasks)
 
-        messages = mock_adapter.complete.call_args.kwargs["messages"]
+        messages = _get_messages(mock_adapter)
         assert messages[0].content == "Custom system prompt"
 
     def test_custom_user_prompt_template(self, mock_adapter, sample_tasks):
         """Test using a custom user prompt template."""
-        mock_adapter.complete.return_value = _make_response([])
+        mock_adapter.complete.return_value = _RESP_EMPTY
         template = "Reply: {reply_body}\nSubject: {subject}\nTasks: {tasks_list}"
         resolver = ReplyResolver(
             adapter=mock_adapter, user_prompt_template=template
@@ -416,7 +435,7 @@ class TestCustomPrompts:
 
         resolver.resolve("Test reply", "Test subject", sample_tasks)
 
-        messages = mock_adapter.complete.call_args.kwargs["messages"]
+        messages = _get_messages(mock_adapter)
         assert "Reply: Test reply" in messages[1].content
         assert "Subject: Test subject" in messages[1].content
 
@@ -444,6 +463,34 @@ class TestFormatTasksList:
 
         assert "Description: Some important context" in result
 
+    def test_format_drops_generated_note_headers(self, resolver):
+        """Test that priority/confidence/link header lines are left out."""
+        notes = (
+            "Priority: high\nConfidence: 90%\n"
+            "Email: https://mail.google.com/mail/#all/thread1\n\n"
+            "Review the Q1 proposal document"
+        )
+        tasks = [Task(title="Task", id="t1", notes=notes)]
+
+        result = resolver._format_tasks_list(tasks)
+
+        assert "Description: Review the Q1 proposal document" in result
+        assert "Priority" not in result
+        assert "mail.google.com" not in result
+
+    def test_format_keeps_header_like_lines_in_description(self, resolver):
+        """Test that only the leading header block is dropped."""
+        notes = (
+            "Priority: high\n\n"
+            "Set the ticket to\nPriority: low\nonce the fix ships"
+        )
+        tasks = [Task(title="Task", id="t1", notes=notes)]
+
+        result = resolver._format_tasks_list(tasks)
+
+        assert "Priority: high" not in result
+        assert "Set the ticket to\nPriority: low\nonce the fix ships" in result
+
     def test_format_truncates_long_notes(self, resolver):
         """Test that long notes are truncated in the formatted list."""
         long_notes = "A" * 300
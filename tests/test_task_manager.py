@@ -1,8 +1,9 @@
 """Unit tests for the TaskManager class."""
 
 from datetime import date
-from unittest.mock import MagicMock
+from unittest.mock import Mock
 
+import httplib2
 import pytest
 from googleapiclient.errors import HttpError
 
@@ -18,14 +19,74 @@ from src.tasks import (
 )
 
 
+_THREAD_TASKS_PAGE = {
+    "items": [
+        {
+            "id": "task1",
+            "title": "Task 1",
+            "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
+            "status": "needsAction",
+        },
+        {
+            "id": "task2",
+            "title": "Task 2",
+            "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
+            "status": "needsAction",
+        },
+    ]
+}
+
+
+def _http_error(status: int, reason: str, **headers: str) -> HttpError:
+    """Build an HttpError around a real httplib2 response."""
+    resp = httplib2.Response({"status": status, "reason": reason, **headers})
+    return HttpError(resp, reason.encode())
+
+
+class _FakeBatch:
+    """Stand-in for BatchHttpRequest that runs queued requests in order."""
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self._requests:
+            try:
+                response = request.execute()
+            except HttpError as e:
+                self._callback(request_id, None, e)
+            else:
+                self._callback(request_id, response, None)
+
+
+@pytest.fixture(scope="module")
+def mock_service():
+    """Create a mock Google Tasks service shared across the module.
+
+    ``_reset_mock_service`` clears it before each test.
+    """
+    return Mock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_service(mock_service):
+    """Give each test a clean service with an "Email Tasks" default list.
+
+    Tests that need other task lists overwrite the tasklists().list() result.
+    """
+    mock_service.reset_mock(return_value=True, side_effect=True)
+    mock_service.tasklists().list().execute.return_value = {
+        "items": [{"id": "default_list", "title": "Email Tasks"}]
+    }
+
+
 class TestTaskManagerWithMock:
     """Tests for TaskManager with mocked API service."""
 
-    @pytest.fixture
-    def mock_service(self):
-        """Create a mock Google Tasks service."""
-        return MagicMock()
-
     @pytest.fixture
     def task_manager(self, mock_service):
         """Create a TaskManager with patched service."""
@@ -96,14 +157,57 @@ class TestTaskManagerWithMock:
         assert task_list.id == "list2"
         assert task_list.title == "Email Tasks"
 
+    def test_default_list_resolved_once(self, task_manager, mock_service):
+        """Test the default list lookup is cached across task operations."""
+        mock_service.tasks().insert().execute.return_value = {"id": "t1", "title": "A"}
+        mock_service.tasks().get().execute.return_value = {"id": "t1", "title": "A"}
+        mock_service.tasks().list().execute.return_value = {"items": []}
+
+        task_manager.create_task(Task(title="A"))
+        task_manager.get_task("t1")
+        list(task_manager.list_tasks())
+
+        assert mock_service.tasklists().list().execute.call_count == 1
+        mock_service.tasklists().get.assert_not_called()
+
+    def test_default_list_cache_dropped_when_list_missing(self, task_manager, mock_service):
+        """Test a 404 on the cached default list forces a fresh lookup."""
+        mock_service.tasks().list().execute.side_effect = _http_error(404, "Not found")
+
+        with pytest.raises(TaskListNotFoundError):
+            list(task_manager.list_tasks())
+        task_manager.get_or_create_default_list()
+
+        assert mock_service.tasklists().list().execute.call_count == 2
+
+    @pytest.mark.parametrize(
+        "method,call",
+        [
+            ("get", lambda tm: tm.get_task("t1")),
+            ("delete", lambda tm: tm.delete_task("t1")),
+            ("update", lambda tm: tm.update_task(Task(id="t1", title="A"))),
+            ("patch", lambda tm: tm.complete_task("t1")),
+        ],
+        ids=["get", "delete", "update", "complete"],
+    )
+    def test_default_list_cache_dropped_on_task_404(
+        self, task_manager, mock_service, method, call
+    ):
+        """Test a 404 on any task operation forces a fresh list lookup."""
+        getattr(mock_service.tasks(), method)().execute.side_effect = _http_error(
+            404, "Not found"
+        )
+
+        with pytest.raises(TaskNotFoundError):
+            call(task_manager)
+        task_manager.get_or_create_default_list()
+
+        assert mock_service.tasklists().list().execute.call_count == 2
+
     # -------------------- Task CRUD Tests --------------------
 
     def test_create_task(self, task_manager, mock_service):
         """Test creating a task."""
-        # Setup default list
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().insert().execute.return_value = {
             "id": "task123",
             "title": "New Task",
@@ -132,9 +236,6 @@ class TestTaskManagerWithMock:
 
     def test_get_task(self, task_manager, mock_service):
         """Test getting a task by ID."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().get().execute.return_value = {
             "id": "task123",
             "title": "Test Task",
@@ -147,9 +248,6 @@ class TestTaskManagerWithMock:
 
     def test_update_task(self, task_manager, mock_service):
         """Test updating a task."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().update().execute.return_value = {
             "id": "task123",
             "title": "Updated Task",
@@ -169,9 +267,6 @@ class TestTaskManagerWithMock:
 
     def test_delete_task(self, task_manager, mock_service):
         """Test deleting a task."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().delete().execute.return_value = None
 
         task_manager.delete_task("task123")
@@ -179,9 +274,6 @@ class TestTaskManagerWithMock:
 
     def test_list_tasks(self, task_manager, mock_service):
         """Test listing tasks."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().list().execute.return_value = {
             "items": [
                 {"id": "task1", "title": "Task 1", "status": "needsAction"},
@@ -196,9 +288,6 @@ class TestTaskManagerWithMock:
 
     def test_list_tasks_with_pagination(self, task_manager, mock_service):
         """Test listing tasks handles pagination."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
 
         # Return different pages
         mock_service.tasks().list().execute.side_effect = [
@@ -211,22 +300,27 @@ class TestTaskManagerWithMock:
             },
         ]
 
-        tasks = list(task_manager.list_tasks())
-        assert len(tasks) == 2
+        tasks = task_manager.list_tasks()
+        assert next(tasks).id == "task1"
+        # Pages are fetched lazily as the caller iterates
+        assert mock_service.tasks().list().execute.call_count == 1
+        assert [t.id for t in tasks] == ["task2"]
+        # Each page request depends on the token returned by the one before
+        page_tokens = [
+            c.kwargs["pageToken"]
+            for c in mock_service.tasks().list.call_args_list
+            if "pageToken" in c.kwargs
+        ]
+        assert page_tokens == [None, "page2"]
+        assert mock_service.tasks().list.call_args.kwargs["fields"].startswith(
+            "nextPageToken,items("
+        )
 
     # -------------------- Task Status Tests --------------------
 
     def test_complete_task(self, task_manager, mock_service):
-        """Test completing a task."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
-        mock_service.tasks().get().execute.return_value = {
-            "id": "task123",
-            "title": "Test Task",
-            "status": "needsAction",
-        }
-        mock_service.tasks().update().execute.return_value = {
+        """Test completing a task with a single patch."""
+        mock_service.tasks().patch().execute.return_value = {
             "id": "task123",
             "title": "Test Task",
             "status": "completed",
@@ -235,17 +329,15 @@ class TestTaskManagerWithMock:
         completed = task_manager.complete_task("task123")
         assert completed.status == TaskStatus.COMPLETED
 
+        mock_service.tasks().patch.assert_called_with(
+            tasklist="default_list", task="task123", body={"status": "completed"}
+        )
+        mock_service.tasks().get.assert_not_called()
+        mock_service.tasks().update.assert_not_called()
+
     def test_uncomplete_task(self, task_manager, mock_service):
-        """Test marking task as incomplete."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
-        mock_service.tasks().get().execute.return_value = {
-            "id": "task123",
-            "title": "Test Task",
-            "status": "completed",
-        }
-        mock_service.tasks().update().execute.return_value = {
+        """Test marking task as incomplete clears the completion time."""
+        mock_service.tasks().patch().execute.return_value = {
             "id": "task123",
             "title": "Test Task",
             "status": "needsAction",
@@ -254,13 +346,24 @@ class TestTaskManagerWithMock:
         task = task_manager.uncomplete_task("task123")
         assert task.status == TaskStatus.NEEDS_ACTION
 
+        mock_service.tasks().patch.assert_called_with(
+            tasklist="default_list",
+            task="task123",
+            body={"status": "needsAction", "completed": None},
+        )
+        mock_service.tasks().get.assert_not_called()
+
+    def test_complete_missing_task(self, task_manager, mock_service):
+        """Test completing a task that no longer exists."""
+        mock_service.tasks().patch().execute.side_effect = _http_error(404, "Not found")
+
+        with pytest.raises(TaskNotFoundError):
+            task_manager.complete_task("task123")
+
     # -------------------- Email Integration Tests --------------------
 
     def test_create_from_extracted_task(self, task_manager, mock_service):
         """Test creating task from ExtractedTask."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().insert().execute.return_value = {
             "id": "task123",
             "title": "Reply to John",
@@ -284,9 +387,6 @@ class TestTaskManagerWithMock:
 
     def test_create_from_extracted_task_includes_email_link(self, task_manager, mock_service):
         """Test that created task notes include a Gmail link to the source email."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().insert().execute.return_value = {
             "id": "task123",
             "title": "Reply to John",
@@ -307,11 +407,73 @@ class TestTaskManagerWithMock:
         body = call_args.kwargs.get("body", {})
         assert "https://mail.google.com/mail/#all/thread456" in body["notes"]
 
+    def test_create_from_extracted_tasks_batches_inserts(self, task_manager, mock_service):
+        """Test several ExtractedTasks are inserted in one batch request."""
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().insert().execute.side_effect = [
+            {"id": "task1", "title": "Reply to John", "status": "needsAction"},
+            {"id": "task2", "title": "Book room", "status": "needsAction"},
+        ]
+        extracted = [
+            ExtractedTask(
+                title=title,
+                description="",
+                priority=Priority.MEDIUM,
+                source_email_id="email123",
+                source_thread_id="thread456",
+            )
+            for title in ("Reply to John", "Book room")
+        ]
+
+        tasks = task_manager.create_from_extracted_tasks(extracted)
+
+        assert [t.id for t in tasks] == ["task1", "task2"]
+        mock_service.new_batch_http_request.assert_called_once()
+        body = mock_service.tasks().insert.call_args.kwargs["body"]
+        assert "https://mail.google.com/mail/#all/thread456" in body["notes"]
+
+    def test_create_from_extracted_tasks_missing_list(self, task_manager, mock_service):
+        """Test a 404 inside the batch surfaces as TaskListNotFoundError."""
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().insert().execute.side_effect = _http_error(404, "Not found")
+        extracted = ExtractedTask(
+            title="Reply",
+            description="",
+            priority=Priority.LOW,
+            source_email_id="email123",
+            source_thread_id="thread456",
+        )
+
+        with pytest.raises(TaskListNotFoundError):
+            task_manager.create_from_extracted_tasks([extracted], list_id="gone")
+
+    def test_create_from_extracted_tasks_logs_other_failures(
+        self, task_manager, mock_service, caplog
+    ):
+        """Test batch failures beyond the raised one are logged."""
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().insert().execute.side_effect = [
+            _http_error(404, "Not found"),
+            _http_error(500, "Backend error"),
+        ]
+        extracted = [
+            ExtractedTask(
+                title=title,
+                description="",
+                priority=Priority.LOW,
+                source_email_id="email123",
+                source_thread_id="thread456",
+            )
+            for title in ("First", "Second")
+        ]
+
+        with pytest.raises(TaskListNotFoundError):
+            task_manager.create_from_extracted_tasks(extracted, list_id="list1")
+        assert "'Second'" in caplog.text
+        assert "status=500" in caplog.text
+
     def test_find_tasks_by_thread_id(self, task_manager, mock_service):
         """Test finding tasks by thread ID."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().list().execute.return_value = {
             "items": [
                 {
@@ -341,9 +503,6 @@ class TestTaskManagerWithMock:
 
     def test_find_tasks_by_email_id(self, task_manager, mock_service):
         """Test finding tasks by email ID."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
         mock_service.tasks().list().execute.return_value = {
             "items": [
                 {
@@ -365,57 +524,101 @@ class TestTaskManagerWithMock:
         assert len(tasks) == 1
         assert tasks[0].source_email_id == "email123"
 
-    def test_complete_tasks_for_thread(self, task_manager, mock_service):
-        """Test completing all tasks for a thread."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
-        mock_service.tasklists().get().execute.return_value = {
-            "id": "default_list",
-            "title": "Email Tasks",
-        }
-        mock_service.tasks().list().execute.return_value = {
-            "items": [
-                {
-                    "id": "task1",
-                    "title": "Task 1",
-                    "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
-                    "status": "needsAction",
-                },
-                {
-                    "id": "task2",
-                    "title": "Task 2",
-                    "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
-                    "status": "needsAction",
-                },
-            ]
-        }
-        mock_service.tasks().get().execute.return_value = {
-            "id": "task1",
-            "title": "Task 1",
+    def test_find_tasks_lists_once(self, task_manager, mock_service):
+        """Test repeated lookups are served from a single task listing."""
+        mock_service.tasks().list().execute.return_value = _THREAD_TASKS_PAGE
+
+        task_manager.find_tasks_by_thread_id("thread123")
+        task_manager.find_tasks_by_thread_id("thread456")
+        task_manager.find_tasks_by_email_id("email123")
+
+        assert mock_service.tasks().list().execute.call_count == 1
+
+    def test_find_tasks_index_follows_writes(self, task_manager, mock_service):
+        """Test the lookup index reflects tasks created, completed and deleted."""
+        mock_service.tasks().list().execute.return_value = _THREAD_TASKS_PAGE
+        assert len(task_manager.find_tasks_by_thread_id("thread123")) == 2
+
+        mock_service.tasks().insert().execute.return_value = {
+            "id": "task3",
+            "title": "Task 3",
+            "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
             "status": "needsAction",
         }
+        task_manager.create_task(Task(title="Task 3", source_thread_id="thread123"))
+        task_manager.delete_task("task1")
         mock_service.tasks().update().execute.return_value = {
-            "id": "task1",
-            "title": "Task 1",
+            "id": "task2",
+            "title": "Task 2",
+            "notes": f"{Task.METADATA_PREFIX}\nthread_id:thread123",
             "status": "completed",
         }
+        task_manager.update_task(Task(title="Task 2", id="task2"))
+
+        open_tasks = task_manager.find_tasks_by_thread_id(
+            "thread123", include_completed=False
+        )
+        all_tasks = task_manager.find_tasks_by_thread_id("thread123")
+
+        assert [t.id for t in open_tasks] == ["task3"]
+        assert sorted(t.id for t in all_tasks) == ["task2", "task3"]
+        assert mock_service.tasks().list().execute.call_count == 1
+
+    def test_complete_tasks_for_thread(self, task_manager, mock_service):
+        """Test completing all tasks for a thread in one batch request."""
+        mock_service.tasks().list().execute.return_value = _THREAD_TASKS_PAGE
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().patch().execute.side_effect = [
+            {"id": "task1", "title": "Task 1", "status": "completed"},
+            {"id": "task2", "title": "Task 2", "status": "completed"},
+        ]
 
         completed = task_manager.complete_tasks_for_thread("thread123")
-        # At least one task should be processed (mock returns same for all gets)
-        assert len(completed) >= 1
+
+        assert [t.id for t in completed] == ["task1", "task2"]
+        assert all(t.status == TaskStatus.COMPLETED for t in completed)
+        mock_service.new_batch_http_request.assert_called_once()
+        mock_service.tasks().patch.assert_any_call(
+            tasklist="default_list", task="task2", body={"status": "completed"}
+        )
+        mock_service.tasks().get.assert_not_called()
+        mock_service.tasks().update.assert_not_called()
+
+    def test_complete_tasks_for_thread_missing_task(self, task_manager, mock_service):
+        """Test a 404 inside the batch surfaces as TaskNotFoundError."""
+        mock_service.tasks().list().execute.return_value = _THREAD_TASKS_PAGE
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().patch().execute.side_effect = [
+            {"id": "task1", "title": "Task 1", "status": "completed"},
+            _http_error(404, "Not found"),
+        ]
+
+        with pytest.raises(TaskNotFoundError) as exc_info:
+            task_manager.complete_tasks_for_thread("thread123")
+        assert exc_info.value.task_id == "task2"
+
+    def test_complete_tasks_for_thread_logs_other_failures(
+        self, task_manager, mock_service, caplog
+    ):
+        """Test batch failures beyond the raised one are logged."""
+        mock_service.tasks().list().execute.return_value = _THREAD_TASKS_PAGE
+        mock_service.new_batch_http_request.side_effect = _FakeBatch
+        mock_service.tasks().patch().execute.side_effect = [
+            _http_error(404, "Not found"),
+            _http_error(500, "Backend error"),
+        ]
+
+        with pytest.raises(TaskNotFoundError) as exc_info:
+            task_manager.complete_tasks_for_thread("thread123")
+        assert exc_info.value.task_id == "task1"
+        assert "task2" in caplog.text
+        assert "status=500" in caplog.text
 
     # -------------------- Error Handling Tests --------------------
 
     def test_task_not_found_error(self, task_manager, mock_service):
         """Test TaskNotFoundError is raised for 404."""
-        mock_service.tasklists().list().execute.return_value = {
-            "items": [{"id": "default_list", "title": "Email Tasks"}]
-        }
-        mock_resp = MagicMock()
-        mock_resp.status = 404
-        error = HttpError(mock_resp, b"Not found")
-        mock_service.tasks().get().execute.side_effect = error
+        mock_service.tasks().get().execute.side_effect = _http_error(404, "Not found")
 
         with pytest.raises(TaskNotFoundError) as exc_info:
             task_manager.get_task("nonexistent")
@@ -423,10 +626,7 @@ class TestTaskManagerWithMock:
 
     def test_task_list_not_found_error(self, task_manager, mock_service):
         """Test TaskListNotFoundError is raised for 404 on list."""
-        mock_resp = MagicMock()
-        mock_resp.status = 404
-        error = HttpError(mock_resp, b"Not found")
-        mock_service.tasklists().get().execute.side_effect = error
+        mock_service.tasklists().get().execute.side_effect = _http_error(404, "Not found")
 
         with pytest.raises(TaskListNotFoundError) as exc_info:
             task_manager.get_task_list("nonexistent")
@@ -434,11 +634,9 @@ class TestTaskManagerWithMock:
 
     def test_rate_limit_error(self, task_manager, mock_service):
         """Test RateLimitError is raised for 429."""
-        mock_resp = MagicMock()
-        mock_resp.status = 429
-        mock_resp.get.return_value = "60"
-        error = HttpError(mock_resp, b"Rate limit exceeded")
-        mock_service.tasklists().list().execute.side_effect = error
+        mock_service.tasklists().list().execute.side_effect = _http_error(
+            429, "Rate limit exceeded", **{"retry-after": "60"}
+        )
 
         with pytest.raises(RateLimitError) as exc_info:
             task_manager.list_task_lists()
@@ -446,11 +644,9 @@ class TestTaskManagerWithMock:
 
     def test_generic_api_error(self, task_manager, mock_service):
         """Test TasksAPIError for other HTTP errors."""
-        mock_resp = MagicMock()
-        mock_resp.status = 500
-        error = HttpError(mock_resp, b"Internal server error")
-        error.reason = "Internal server error"
-        mock_service.tasklists().list().execute.side_effect = error
+        mock_service.tasklists().list().execute.side_effect = _http_error(
+            500, "Internal server error"
+        )
 
         with pytest.raises(TasksAPIError) as exc_info:
             task_manager.list_task_lists()
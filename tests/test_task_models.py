@@ -65,6 +65,11 @@ class TestTaskList:
         assert task_list.id == "list123"
         assert task_list.title == "My Tasks"
 
+    def test_uses_slots(self):
+        """Test that task lists carry no per-instance __dict__."""
+        task_list = TaskList(id="list123", title="My Tasks")
+        assert not hasattr(task_list, "__dict__")
+
 
 class TestTask:
     """Tests for Task dataclass."""
@@ -133,12 +138,6 @@ class TestTask:
         assert "due" not in body
         assert "id" not in body
 
-    def test_to_api_body_includes_id(self):
-        """Test API body includes ID when set (required for update)."""
-        task = Task(id="task123", title="Test Task")
-        body = task.to_api_body()
-        assert body["id"] == "task123"
-
     def test_to_api_body_with_metadata(self):
         """Test API body includes email metadata in notes."""
         task = Task(
@@ -153,17 +152,26 @@ class TestTask:
         assert "thread_id:thread456" in body["notes"]
         assert Task.METADATA_PREFIX in body["notes"]
 
-    def test_to_api_body_with_due_date(self):
-        """Test API body formats due date correctly."""
-        task = Task(title="Test Task", due=date(2024, 1, 20))
-        body = task.to_api_body()
-        assert body["due"] == "2024-01-20T00:00:00.000Z"
-
-    def test_to_api_body_truncates_title(self):
-        """Test API body truncates long titles to 1024 chars."""
-        task = Task(title="x" * 2000)
-        body = task.to_api_body()
-        assert len(body["title"]) == 1024
+    @pytest.mark.parametrize(
+        "task,key,expected",
+        [
+            # ID is required for update
+            (Task(id="task123", title="Test Task"), "id", "task123"),
+            # Due date is sent as RFC 3339
+            (
+                Task(title="Test Task", due=date(2024, 1, 20)),
+                "due",
+                "2024-01-20T00:00:00.000Z",
+            ),
+            # Titles are truncated to the API's 1024 char limit
+            (Task(title="x" * 2000), "title", "x" * 1024),
+            (Task(title="Done", status=TaskStatus.COMPLETED), "status", "completed"),
+        ],
+        ids=["id", "due_date", "truncated_title", "status"],
+    )
+    def test_to_api_body_field(self, task, key, expected):
+        """Test individual fields of the generated API body."""
+        assert task.to_api_body()[key] == expected
 
     def test_from_api_response_basic(self):
         """Test creation from API response."""
@@ -190,6 +198,26 @@ class TestTask:
         assert task.source_email_id == "email123"
         assert task.source_thread_id == "thread456"
 
+    def test_from_api_response_ignores_unknown_metadata_lines(self):
+        """Test only known metadata keys are extracted, trimming whitespace."""
+        data = {
+            "id": "task123",
+            "title": "Test Task",
+            "notes": (
+                f"{Task.METADATA_PREFIX}\r\nsource:gmail\r\n"
+                "thread_id:thread456 \r\nemail_id:email123\r\n"
+            ),
+        }
+        task = Task.from_api_response(data)
+        assert task.notes is None
+        assert task.source_email_id == "email123"
+        assert task.source_thread_id == "thread456"
+
+    def test_from_api_response_rejects_unknown_status(self):
+        """Test an unrecognised status still raises ValueError."""
+        with pytest.raises(ValueError):
+            Task.from_api_response({"id": "t1", "title": "T", "status": "archived"})
+
     def test_from_api_response_with_due_date(self):
         """Test due date parsing from API response."""
         data = {
@@ -230,11 +258,18 @@ class TestTask:
 
     def test_mark_incomplete(self):
         """Test marking task as incomplete."""
-        task = Task(title="Test", status=TaskStatus.COMPLETED, completed=datetime.now())
+        task = Task(title="Test", status=TaskStatus.COMPLETED, completed=datetime(2024, 1, 18, 14, 30))
         task.mark_incomplete()
         assert task.status == TaskStatus.NEEDS_ACTION
         assert task.completed is None
 
+    def test_uses_slots(self):
+        """Test that tasks carry no per-instance __dict__."""
+        task = Task(id="x", title="y")
+        assert not hasattr(task, "__dict__")
+        with pytest.raises(AttributeError):
+            task.unknown_field = "z"
+
 
 class TestExceptions:
     """Tests for exception classes."""
@@ -32,6 +32,12 @@ class TestTasksIntegration:
         auth = TasksAuthenticator()
         return auth.get_service()
 
+    @pytest.fixture(scope="class")
+    def default_list_id(self, tasks_service):
+        """ID of the first task list, looked up once for the class."""
+        task_lists = tasks_service.tasklists().list(maxResults=1).execute()
+        return task_lists["items"][0]["id"]
+
     def test_credentials_file_exists(self):
         """Verify credentials.json exists at the default location."""
         assert DEFAULT_CREDENTIALS_PATH.exists(), (
@@ -53,12 +59,8 @@ class TestTasksIntegration:
         for tl in task_lists:
             print(f"  - {tl['title']} (id: {tl['id']})")
 
-    def test_can_create_and_delete_task(self, tasks_service):
+    def test_can_create_and_delete_task(self, tasks_service, default_list_id):
         """Create a test task and then delete it."""
-        # Get the default task list
-        task_lists = tasks_service.tasklists().list(maxResults=1).execute()
-        default_list_id = task_lists["items"][0]["id"]
-
         # Create a test task
         test_task = {
             "title": "[TEST] Integration test task - safe to delete",
@@ -82,12 +84,8 @@ class TestTasksIntegration:
 
         print(f"Deleted task: {created['id']}")
 
-    def test_can_read_task_details(self, tasks_service):
+    def test_can_read_task_details(self, tasks_service, default_list_id):
         """Create a task, read it back, then delete it."""
-        # Get the default task list
-        task_lists = tasks_service.tasklists().list(maxResults=1).execute()
-        default_list_id = task_lists["items"][0]["id"]
-
         # Create a test task with notes
         test_task = {
             "title": "[TEST] Read test task",